@@ -1,16 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from datetime import timedelta
 from typing import Annotated
 from app.schemas.item_schemas import UserCreate, UserResponse
 from app.database.connection import get_db
 from app.database.models import User
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.utils.auth import (
     authenticate_user,
     create_access_token,
     get_current_user,
-    get_password_hash,
+    get_user_by_email,
+    hash_password_async,
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -18,9 +20,30 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 # OAuth2 Configuration
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Function to persist a new user
+def save_user(db: Session, user: UserCreate, hashed_password: str) -> User:
+    """
+    Saves a new user in the database.
+
+    - **Parameters**:
+        - `db`: Database session.
+        - `user`: UserCreate schema containing user details.
+        - `hashed_password`: The already hashed password.
+
+    - **Returns**:
+        - The persisted user, read back through `INSERT ... RETURNING` in a single round-trip.
+    """
+    new_user = db.execute(
+        insert(User)
+        .values(name=user.name, email=user.email, password=hashed_password)
+        .returning(User)
+    ).scalar_one()
+    db.commit()
+    return new_user
+
 # Endpoint for user registration
 @router.post("/register", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
 
@@ -35,29 +58,21 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         - HTTPException (400): If the email is already registered.
     """
     # Check if the user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await run_in_threadpool(get_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Create a new user
-    hashed_password =  get_password_hash(user.password)
-    new_user = User(
-        name=user.name,
-        email=user.email,
-        password=hashed_password,
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Create a new user, hashing the password off the event loop
+    hashed_password = await hash_password_async(user.password)
 
-    return new_user
+    return await run_in_threadpool(save_user, db, user, hashed_password)
 
 # Endpoint for user login
 @router.post("/token")
-def login_for_access_token(
+async def login_for_access_token(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
         db: Session = Depends(get_db),
 ):
@@ -75,7 +90,7 @@ def login_for_access_token(
         - HTTPException (401): If the email or password is incorrect.
     """
     # Authenticate the user
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -83,11 +98,8 @@ def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create the JWT token
-    access_token_expires = timedelta(minutes=30)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    # Create the JWT token (valid for ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(data={"sub": user.email})
 
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -1,36 +1,78 @@
-from fastapi import  APIRouter, HTTPException, status
+from fastapi import  APIRouter, HTTPException, Query, Response, status
 from fastapi.params import Depends
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 from app.database.connection import get_db
 from app.utils.auth import get_current_user
+from app.utils.cache import products_cache, categories_cache, cache_get, cache_set, cache_clear
+from app.utils.pagination import MAX_PAGE_SIZE
 from app.database.models import User
 from app.schemas.item_schemas import (
     ProductCreate,
     ProductResponse,
+    ProductPage,
     InventoryTransactionCreate,
     InventoryTransactionResponse,
+    InventoryTransactionPage,
     CategoryCreate,
-    CategoryResponse
+    CategoryResponse,
+    CategoryPage
 )
 from app.services.inventory_service import (
     create_product,
+    create_products,
     get_products,
     get_product,
     update_product,
     delete_product,
     create_inventory_transaction,
+    create_inventory_transactions,
     get_inventory_transactions,
     get_inventory_transaction,
     create_category,
     get_categories,
     get_category,
     update_category,
-    delete_category
+    delete_category,
+    CategoryAlreadyExistsError
 )
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Categories get their own prefix so they never overlap with /products/{product_id}
+categories_router = APIRouter(prefix="/categories", tags=["categories"])
+
+# Serializers built once and reused by the cached endpoints
+product_adapter = TypeAdapter(ProductResponse)
+products_adapter = TypeAdapter(ProductPage)
+products_list_adapter = TypeAdapter(List[ProductResponse])
+transactions_adapter = TypeAdapter(InventoryTransactionPage)
+transactions_list_adapter = TypeAdapter(List[InventoryTransactionResponse])
+category_adapter = TypeAdapter(CategoryResponse)
+categories_adapter = TypeAdapter(CategoryPage)
+
+# Function to serialize ORM objects straight to a JSON response
+def json_response(adapter: TypeAdapter, data) -> Response:
+    """
+    Serializes an ORM object, a list or a page of them to a JSON response in a single pass.
+
+    Returning a Response skips FastAPI's per-item `response_model` serialization,
+    while the route keeps its `response_model` for the documentation.
+
+    - **Parameters**:
+        - `adapter`: The TypeAdapter for the response schema.
+        - `data`: The ORM object(s) (or a page dict containing them) to serialize.
+
+    - **Returns**:
+        - A Response with the JSON encoded data.
+    """
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(data, from_attributes=True)),
+        media_type="application/json",
+    )
+
 # Endpoint for creating a product
 @router.post("/", response_model=ProductResponse)
 def create_new_product(
@@ -54,6 +96,7 @@ def create_new_product(
     """
     try:
         new_product = create_product(db, product, current_user.id)
+        cache_clear(products_cache)
         return new_product
     except ValueError as e:
         raise HTTPException(
@@ -61,36 +104,86 @@ def create_new_product(
             detail=str(e),
         )
 
+# Endpoint for creating several products at once
+@router.post("/bulk", response_model=List[ProductResponse])
+def create_new_products_bulk(
+    products: List[ProductCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create several products in the inventory in a single database round-trip.
+
+    - **Parameters**:
+        - `products`: List of ProductCreate schemas containing product details.
+        - `db`: Database session dependency.
+        - `current_user`: The authenticated user (retrieved via JWT token).
+
+    - **Returns**:
+        - A list of ProductResponse schemas with the newly created products' details.
+
+    - **Raises**:
+        - HTTPException (400): If the product data is invalid. No product is created.
+    """
+    try:
+        new_products = create_products(db, products, current_user.id)
+        cache_clear(products_cache)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return json_response(products_list_adapter, new_products)
+
 # Endpoint to list all products
-@router.get("/", response_model=List[ProductResponse])
+@router.get("/", response_model=ProductPage)
 def list_products(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
 ):
     """
-    List all products in the inventory.
+    List all products in the inventory, newest first.
+
+    Pages are cached for 30 seconds and invalidated by every product or stock change.
 
     - **Parameters**:
-        - `skip`: Number of products to skip (for pagination).
-        - `limit`: Maximum number of products to return (for pagination).
+        - `cursor`: The `next_cursor` of the previous page (omit for the first page).
+        - `limit`: Maximum number of products to return (for pagination), from 1 to `MAX_PAGE_SIZE`.
         - `db`: Database session dependency.
 
     - **Returns**:
-        - A list of ProductResponse schemas.
+        - A ProductPage schema with the products and the cursor of the next page.
+
+    - **Raises**:
+        - HTTPException (400): If the cursor is invalid.
     """
-    products = get_products(db, skip=skip, limit=limit)
-    return products
+    cached = cache_get(products_cache, (cursor, limit))
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    try:
+        products = get_products(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    response = json_response(products_adapter, products)
+    cache_set(products_cache, (cursor, limit), response.body)
+    return response
 
 # Endpoint to query a specific product
 @router.get("/{product_id}", response_model=ProductResponse)
 def read_product(
-        product_id: str,
+        product_id: UUID,
         db: Session = Depends(get_db)
 ):
     """
     Retrieve details of a specific product.
 
+    The response is cached for 30 seconds and invalidated by every product or stock change.
+
     - **Parameters**:
         - `product_id`: The ID of the product to retrieve.
         - `db`: Database session dependency.
@@ -101,18 +194,24 @@ def read_product(
     - **Raises**:
         - HTTPException (404): If the product is not found.
     """
+    cached = cache_get(products_cache, product_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     product = get_product(db, product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
         )
-    return product
+    response = json_response(product_adapter, product)
+    cache_set(products_cache, product_id, response.body)
+    return response
 
 # Endpoint for editing a product
 @router.put("/{product_id}", response_model=ProductResponse)
 def update_existing_product(
-        product_id: str,
+        product_id: UUID,
         product: ProductCreate,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
@@ -134,6 +233,7 @@ def update_existing_product(
     """
     try:
         updated_product = update_product(db, product_id, product)
+        cache_clear(products_cache)
         return updated_product
     except ValueError as e:
         raise HTTPException(
@@ -144,7 +244,7 @@ def update_existing_product(
 # Endpoint to delete a product
 @router.delete("/{product_id}", response_model=ProductResponse)
 def delete_existing_product(
-        product_id: str,
+        product_id: UUID,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
 ):
@@ -164,6 +264,7 @@ def delete_existing_product(
     """
     try:
         deleted_product = delete_product(db, product_id)
+        cache_clear(products_cache)
         return deleted_product
     except ValueError as e:
         raise HTTPException(
@@ -174,7 +275,7 @@ def delete_existing_product(
 # Endpoint for recording a stock movement
 @router.post("/{product_id}/transactions", response_model=InventoryTransactionResponse)
 def create_transaction(
-        product_id: str,
+        product_id: UUID,
         transaction: InventoryTransactionCreate,
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user),
@@ -196,6 +297,7 @@ def create_transaction(
     """
     try:
         new_transaction = create_inventory_transaction(db, product_id, transaction, current_user.id)
+        cache_clear(products_cache)
         return new_transaction
     except ValueError as e:
         raise HTTPException(
@@ -203,34 +305,76 @@ def create_transaction(
             detail=str(e),
         )
 
+# Endpoint for recording several stock movements at once
+@router.post("/{product_id}/transactions/bulk", response_model=List[InventoryTransactionResponse])
+def create_transactions_bulk(
+        product_id: UUID,
+        transactions: List[InventoryTransactionCreate],
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+):
+    """
+    Record several stock movements for a specific product in a single database round-trip.
+
+    - **Parameters**:
+        - `product_id`: The ID of the product associated with the transactions.
+        - `transactions`: List of InventoryTransactionCreate schemas, applied in order.
+        - `db`: Database session dependency.
+        - `current_user`: The authenticated user (retrieved via JWT token).
+
+    - **Returns**:
+        - A list of InventoryTransactionResponse schemas with the recorded transactions' details.
+
+    - **Raises**:
+        - HTTPException (400): If the transaction data is invalid. No transaction is recorded.
+    """
+    try:
+        new_transactions = create_inventory_transactions(db, product_id, transactions, current_user.id)
+        cache_clear(products_cache)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return json_response(transactions_list_adapter, new_transactions)
+
 # Endpoint to list all stock movements of a product
-@router.get("/{product_id}/transactions", response_model=List[InventoryTransactionResponse])
+@router.get("/{product_id}/transactions", response_model=InventoryTransactionPage)
 def list_transactions(
-        product_id: str,
-        skip: int = 0,
-        limit: int = 100,
+        product_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
         db: Session = Depends(get_db),
 ):
     """
-    List all stock movements for a specific product.
+    List all stock movements for a specific product, newest first.
 
     - **Parameters**:
         - `product_id`: The ID of the product to retrieve transactions for.
-        - `skip`: Number of transactions to skip (for pagination).
-        - `limit`: Maximum number of transactions to return (for pagination).
+        - `cursor`: The `next_cursor` of the previous page (omit for the first page).
+        - `limit`: Maximum number of transactions to return (for pagination), from 1 to `MAX_PAGE_SIZE`.
         - `db`: Database session dependency.
 
     - **Returns**:
-        - A list of InventoryTransactionResponse schemas.
+        - An InventoryTransactionPage schema with the transactions and the cursor of the next page.
+
+    - **Raises**:
+        - HTTPException (400): If the cursor is invalid.
     """
-    transactions = get_inventory_transactions(db, product_id, skip=skip, limit=limit)
-    return transactions
+    try:
+        transactions = get_inventory_transactions(db, product_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return json_response(transactions_adapter, transactions)
 
 # Endpoint to query a specific stock movement
 @router.get("/{product_id}/transactions/{transaction_id}", response_model=InventoryTransactionResponse)
 def read_transaction(
-        product_id: str,
-        transaction_id: str,
+        product_id: UUID,
+        transaction_id: UUID,
         db: Session = Depends(get_db),
 ):
     """
@@ -256,7 +400,7 @@ def read_transaction(
     return transaction
 
 # Endpoint for creating a category
-@router.post("/categories", response_model=CategoryCreate)
+@categories_router.post("/", response_model=CategoryResponse)
 def create_new_category(
         category: CategoryCreate,
         db: Session = Depends(get_db),
@@ -271,13 +415,14 @@ def create_new_category(
         - `current_user`: The authenticated user (retrieved via JWT token).
 
     - **Returns**:
-        - CategoryCreate schema with the newly created category's details.
+        - CategoryResponse schema with the newly created category's details.
 
     - **Raises**:
         - HTTPException (400): If the category data is invalid.
     """
     try:
         new_category = create_category(db, category)
+        cache_clear(categories_cache)
         return new_category
     except ValueError as e:
         raise HTTPException(
@@ -286,35 +431,54 @@ def create_new_category(
         )
 
 # Endpoint to list all categories
-@router.get("/categories", response_model=List[CategoryResponse])
+@categories_router.get("/", response_model=CategoryPage)
 def list_categories(
-        skip: int = 0,
-        limit: int = 100,
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
         db: Session = Depends(get_db),
 ):
     """
-    List all categories in the inventory.
+    List all categories in the inventory, newest first.
+
+    Pages are cached for 30 seconds and invalidated by every category change.
 
     - **Parameters**:
-        - `skip`: Number of categories to skip (for pagination).
-        - `limit`: Maximum number of categories to return (for pagination).
+        - `cursor`: The `next_cursor` of the previous page (omit for the first page).
+        - `limit`: Maximum number of categories to return (for pagination), from 1 to `MAX_PAGE_SIZE`.
         - `db`: Database session dependency.
 
     - **Returns**:
-        - A list of CategoryResponse schemas.
+        - A CategoryPage schema with the categories and the cursor of the next page.
+
+    - **Raises**:
+        - HTTPException (400): If the cursor is invalid.
     """
-    categories = get_categories(db, skip=skip, limit=limit)
-    return categories
+    cached = cache_get(categories_cache, (cursor, limit))
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    try:
+        categories = get_categories(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    response = json_response(categories_adapter, categories)
+    cache_set(categories_cache, (cursor, limit), response.body)
+    return response
 
 # Endpoint to query a specific category
-@router.get("/categories/{category_id}", response_model=CategoryResponse)
+@categories_router.get("/{category_id}", response_model=CategoryResponse)
 def read_category(
-        category_id: str,
+        category_id: UUID,
         db: Session = Depends(get_db),
 ):
     """
     Retrieve details of a specific category.
 
+    The response is cached for 30 seconds and invalidated by every category change.
+
     - **Parameters**:
         - `category_id`: The ID of the category to retrieve.
         - `db`: Database session dependency.
@@ -325,18 +489,24 @@ def read_category(
     - **Raises**:
         - HTTPException (404): If the category is not found.
     """
+    cached = cache_get(categories_cache, category_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     category = get_category(db, category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
-    return category
+    response = json_response(category_adapter, category)
+    cache_set(categories_cache, category_id, response.body)
+    return response
 
 # Endpoint for editing a category
-@router.put("/categories/{category_id}", response_model=CategoryResponse)
+@categories_router.put("/{category_id}", response_model=CategoryResponse)
 def update_existing_category(
-        category_id: str,
+        category_id: UUID,
         category: CategoryCreate,
         db: Session = Depends(get_db),
 ):
@@ -352,11 +522,18 @@ def update_existing_category(
         - CategoryResponse schema with the updated category's details.
 
     - **Raises**:
+        - HTTPException (400): If another category already has the name.
         - HTTPException (404): If the category is not found.
     """
     try:
         updated_category = update_category(db, category_id, category)
+        cache_clear(categories_cache)
         return updated_category
+    except CategoryAlreadyExistsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -364,9 +541,9 @@ def update_existing_category(
         )
 
 # Endpoint to delete a category
-@router.delete("/categories/{category_id}", response_model=CategoryResponse)
+@categories_router.delete("/{category_id}", response_model=CategoryResponse)
 def delete_existing_category(
-        category_id: str,
+        category_id: UUID,
         db: Session = Depends(get_db),
 ):
     """
@@ -384,6 +561,7 @@ def delete_existing_category(
     """
     try:
         deleted_category = delete_category(db, category_id)
+        cache_clear(categories_cache)
         return deleted_category
     except ValueError as e:
         raise HTTPException(
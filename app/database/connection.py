@@ -1,9 +1,14 @@
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Loads environment variables from the .env file
 load_dotenv()
 
@@ -17,14 +22,29 @@ DB_NAME = os.getenv("DB_NAME")
 # Database connection URL
 DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Check the connection URL
-print(f"Connecting to database: {DATABASE_URL}")
+# Log the target database (never the URL, it contains the password)
+logger.debug("Connecting to database host=%s db=%s", DB_HOST, DB_NAME)
+
+# Connection pool settings (per worker process: keep workers x (size + overflow) below max_connections)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20")) # Connections kept open in the pool
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10")) # Extra connections allowed under burst load
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30")) # Seconds to wait for a free connection
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800")) # Recycles connections older than this (seconds)
+WARM_POOL = os.getenv("DB_WARM_POOL", "false").lower() == "true" # Opens the pool's connections on startup (opt-in)
 
-# Creates the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# Creates the SQLAlchemy engine with a sized connection pool
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_pre_ping=True, # Checks connections on checkout to drop dead sockets
+    pool_recycle=POOL_RECYCLE,
+)
 
 # Create a session factory
-SessionLocal =sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects keep their loaded state after commit, so returning them does not trigger a reload
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base for the models
 Base = declarative_base()
@@ -45,7 +65,7 @@ def get_db():
     ```python
     def some_endpoint(db: Session = Depends(get_db)):
         # Use the database session
-        db.query(...)
+        db.scalars(select(...))
     ```
     """
     db = SessionLocal()
@@ -53,3 +73,42 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Function to open the pooled connections ahead of the first requests
+def warm_pool(size: int = POOL_SIZE):
+    """
+    Opens `size` connections concurrently and returns them to the pool, so the
+    first requests after a deploy don't each pay the connection handshake.
+
+    - **Parameters**:
+        - `size`: Number of connections to open (defaults to the pool size).
+
+    - **Notes**:
+        - Best effort: if the database is unreachable a warning is logged and
+          connections will be opened on demand as usual.
+        - Does nothing when `size` is zero or less (e.g. `DB_POOL_SIZE=0`).
+    """
+    if size <= 0:
+        return
+
+    def open_connection(_):
+        connection = engine.connect()
+        connection.execute(text("SELECT 1"))
+        return connection
+
+    connections = []
+    error = None
+    try:
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(open_connection, i) for i in range(size)]
+            for future in futures:
+                try:
+                    connections.append(future.result())
+                except SQLAlchemyError as e:
+                    error = e
+        if error is not None:
+            logger.warning("Could not warm the connection pool: %s", error)
+    finally:
+        # Closing a pooled connection returns it to the pool, still open
+        for connection in connections:
+            connection.close()
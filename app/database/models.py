@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime, UTC
 from app.database.connection import Base
+from app.schemas.enums import TransactionType
 
 
 class User(Base):
@@ -18,9 +20,9 @@ class User(Base):
     """
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4())
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
-    email = Column(String, unique=True, nullable=False)
+    email = Column(String, unique=True, nullable=False, index=True)
     password = Column(String, nullable=False)
     date_creation = Column(DateTime, default=lambda: datetime.now(UTC))
     date_update = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
@@ -40,39 +42,55 @@ class Product(Base):
     - **user_id**: Foreign key referencing the user who added the product.
     - **date_creation**: Timestamp of product creation.
     - **date_update**: Timestamp of last update.
+    - **category**: The product's category (must be eager-loaded, e.g. with `selectinload`).
+    - **user**: The user who added the product (must be eager-loaded, e.g. with `selectinload`).
     """
     __tablename__ = "products"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4())
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     description = Column(String)
     price = Column(Float, nullable=False)
     stock_quantity = Column(Integer, nullable=False)
     image_url = Column(String)
-    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id"), nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     date_creation = Column(DateTime, default=lambda: datetime.now(UTC))
     date_update = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
 
+    # Lazy loads raise instead of silently issuing one query per row (N+1)
+    category = relationship("Category", lazy="raise_on_sql")
+    user = relationship("User", lazy="raise_on_sql")
+
+    # Serves the keyset-paginated product listing
+    __table_args__ = (
+        Index("ix_products_date_creation_id", date_creation.desc(), id.desc()),
+    )
+
 
 class Category(Base):
     """
     Represents a product category.
 
     - **id**: Unique identifier (UUID).
-    - **name**: Category name.
+    - **name**: Category name (unique).
     - **description**: Optional category description.
     - **date_creation**: Timestamp of category creation.
     - **date_update**: Timestamp of last update.
     """
     __tablename__ = "categories"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4())
-    name = Column(String, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String, nullable=False, unique=True)
     description = Column(String)
     date_creation = Column(DateTime, default=lambda: datetime.now(UTC))
     date_update = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
 
+    # Serves the keyset-paginated category listing
+    __table_args__ = (
+        Index("ix_categories_date_creation_id", date_creation.desc(), id.desc()),
+    )
+
 
 class InventoryTransaction(Base):
     """
@@ -80,16 +98,38 @@ class InventoryTransaction(Base):
 
     - **id**: Unique identifier (UUID).
     - **product_id**: Foreign key referencing the product.
-    - **type**: Transaction type (e.g., "incoming", "outgoing").
+    - **type**: Transaction type ("entry" or "exit"), stored as a native enum.
     - **quantity**: Quantity of products moved.
     - **date_transaction**: Timestamp of the transaction.
     - **description**: Optional description of the transaction.
+    - **product**: The product moved (must be eager-loaded, e.g. with `joinedload`).
     """
     __tablename__ = "inventory_transactions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4())
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"), nullable=False)
-    type = Column(String, nullable=False)
+    type = Column(
+        Enum(
+            TransactionType,
+            name="transaction_type",
+            create_constraint=True, # CHECK constraint on backends without native enums
+            values_callable=lambda enum_class: [member.value for member in enum_class],
+        ),
+        nullable=False,
+    )
     quantity = Column(Integer, nullable=False)
     date_transaction = Column(DateTime, default=lambda: datetime.now(UTC))
     description = Column(String)
+
+    # Lazy loads raise instead of silently issuing one query per row (N+1)
+    product = relationship("Product", lazy="raise_on_sql")
+
+    # Serves both the product_id filter and the keyset-paginated listing per product
+    __table_args__ = (
+        Index(
+            "ix_inventory_transactions_product_id_date_transaction_id",
+            product_id,
+            date_transaction.desc(),
+            id.desc(),
+        ),
+    )
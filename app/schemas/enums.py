@@ -0,0 +1,13 @@
+import enum
+
+
+# Shared by the ORM models and the Pydantic schemas, so it must not import either layer
+class TransactionType(str, enum.Enum):
+    """
+    Types of inventory transaction (stock movement).
+
+    - **ENTRY**: Stock coming in, increases the product's stock quantity.
+    - **EXIT**: Stock going out, decreases the product's stock quantity.
+    """
+    ENTRY = "entry"
+    EXIT = "exit"
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
+from app.schemas.enums import TransactionType
 
 # Scheme for creating a user
 class UserCreate(BaseModel):
@@ -68,12 +69,27 @@ class CategoryResponse(BaseModel):
         - `from_attributes=True`: Allows conversion from ORM models to Pydantic models.
     """
     id: UUID
+    name: str
     description: Optional[str] = None
     date_creation: datetime
     date_update: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
+# Scheme for returning a page of categories
+class CategoryPage(BaseModel):
+    """
+    Schema for returning a page of categories (keyset pagination).
+
+    - **Attributes**:
+        - `items`: The categories of the page, newest first.
+        - `has_more`: Whether a next page exists.
+        - `next_cursor`: Cursor to request the next page, or `None` if this is the last page.
+    """
+    items: List[CategoryResponse]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
 # Scheme for creating a product
 class ProductCreate(BaseModel):
     """
@@ -117,6 +133,7 @@ class ProductResponse(BaseModel):
         - `from_attributes=True`: Allows conversion from ORM models to Pydantic models.
     """
     id: UUID
+    name: str
     description: Optional[str] = None
     price: float
     stock_quantity: int
@@ -128,6 +145,20 @@ class ProductResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Scheme for returning a page of products
+class ProductPage(BaseModel):
+    """
+    Schema for returning a page of products (keyset pagination).
+
+    - **Attributes**:
+        - `items`: The products of the page, newest first.
+        - `has_more`: Whether a next page exists.
+        - `next_cursor`: Cursor to request the next page, or `None` if this is the last page.
+    """
+    items: List[ProductResponse]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
 # Scheme for creating an inventory transaction
 class InventoryTransactionCreate(BaseModel):
     """
@@ -140,7 +171,7 @@ class InventoryTransactionCreate(BaseModel):
         - `description`: Optional description of the transaction.
     """
     product_id: UUID
-    type: str
+    type: TransactionType
     quantity: int = Field(gt=0, description="Quantity must be greater than zero")
     description: Optional[str] = None
 
@@ -162,9 +193,23 @@ class InventoryTransactionResponse(BaseModel):
     """
     id: UUID
     product_id: UUID
-    type: str
+    type: TransactionType
     quantity: int
     date_transaction: datetime
     description: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+# Scheme for returning a page of stock transactions
+class InventoryTransactionPage(BaseModel):
+    """
+    Schema for returning a page of inventory transactions (keyset pagination).
+
+    - **Attributes**:
+        - `items`: The transactions of the page, newest first.
+        - `has_more`: Whether a next page exists.
+        - `next_cursor`: Cursor to request the next page, or `None` if this is the last page.
+    """
+    items: List[InventoryTransactionResponse]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
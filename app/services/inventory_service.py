@@ -1,14 +1,28 @@
+from sqlalchemy import delete, exists, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app.database.models import (
     Product,
     Category,
     InventoryTransaction
 )
+from app.schemas.enums import TransactionType
 from app.schemas.item_schemas import (
     ProductCreate,
     InventoryTransactionCreate,
     CategoryCreate
 )
+from app.utils.pagination import decode_cursor, page
+
+# Error for a category name that is already taken
+class CategoryAlreadyExistsError(ValueError):
+    """
+    Raised when a category name is already taken.
+
+    A `ValueError`, so callers catching `ValueError` still catch it. The routers catch it
+    separately to answer 400 rather than the 404 of a missing category.
+    """
 
 # Function to create a product
 def create_product(db: Session, product: ProductCreate, user_id: str):
@@ -21,46 +35,103 @@ def create_product(db: Session, product: ProductCreate, user_id: str):
         - `user_id`: ID of the user creating the product.
 
     - **Returns**:
-        - The newly created product.
+        - The newly created product, read back through `INSERT ... RETURNING`.
 
     - **Raises**:
         - ValueError: If the category does not exist.
     """
-    # Checks if the category exists
-    db_category = db.query(Category).filter(Category.id == product.category_id).first()
-    if not db_category:
+    # Checks if the category exists (SELECT EXISTS, without fetching the row)
+    if not db.scalar(select(exists().where(Category.id == product.category_id))):
         raise ValueError("Category not found")
 
     # Create the product
-    new_product = Product(
-        name=product.name,
-        description=product.description,
-        price=product.price,
-        stock_quantity=product.stock_quantity,
-        image_url=product.image_url,
-        category_id=product.category_id,
-        user_id=user_id,
-    )
-    db.add(new_product)
+    new_product = db.execute(
+        insert(Product)
+        .values(
+            name=product.name,
+            description=product.description,
+            price=product.price,
+            stock_quantity=product.stock_quantity,
+            image_url=product.image_url,
+            category_id=product.category_id,
+            user_id=user_id,
+        )
+        .returning(Product)
+    ).scalar_one()
     db.commit()
-    db.refresh(new_product)
 
     return new_product
 
+# Function to create several products at once
+def create_products(db: Session, products: List[ProductCreate], user_id: str):
+    """
+    Creates several products with one category check and a single multi-row insert.
+
+    - **Parameters**:
+        - `db`: Database session.
+        - `products`: List of ProductCreate schemas containing product details.
+        - `user_id`: ID of the user creating the products.
+
+    - **Returns**:
+        - The newly created products, read back through `INSERT ... RETURNING`.
+
+    - **Raises**:
+        - ValueError: If no products are given or if any category does not exist.
+    """
+    if not products:
+        raise ValueError("No products provided")
+
+    # Checks all the categories with one IN query
+    category_ids = {product.category_id for product in products}
+    found_ids = set(db.scalars(select(Category.id).where(Category.id.in_(category_ids))))
+    if found_ids != category_ids:
+        raise ValueError("Category not found")
+
+    # Create the products
+    new_products = db.execute(
+        insert(Product)
+        .values([
+            dict(
+                name=product.name,
+                description=product.description,
+                price=product.price,
+                stock_quantity=product.stock_quantity,
+                image_url=product.image_url,
+                category_id=product.category_id,
+                user_id=user_id,
+            )
+            for product in products
+        ])
+        .returning(Product)
+    ).scalars().all()
+    db.commit()
+
+    return new_products
+
 # Function to list all products
-def get_products(db: Session, skip: int = 0, limit: int = 100):
+def get_products(db: Session, cursor: Optional[str] = None, limit: int = 100):
     """
-    Retrieves a list of products from the database.
+    Retrieves a page of products from the database, newest first.
+
+    Uses keyset pagination on `(date_creation, id)`, so every page is an index
+    range scan no matter how deep it is, instead of scanning and discarding rows.
 
     - **Parameters**:
         - `db`: Database session.
-        - `skip`: Number of products to skip (for pagination).
+        - `cursor`: Cursor of the last product of the previous page (see `app.utils.pagination`).
         - `limit`: Maximum number of products to return (for pagination).
 
     - **Returns**:
-        - A list of products.
+        - A page dict with the products, `has_more` and `next_cursor` (see `app.utils.pagination.page`).
+
+    - **Raises**:
+        - ValueError: If the cursor is invalid.
     """
-    return db.query(Product).offset(skip).limit(limit).all()
+    stmt = select(Product).order_by(Product.date_creation.desc(), Product.id.desc())
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Product.date_creation, Product.id) < tuple_(last_date, last_id))
+    return page(db.scalars(stmt.limit(limit + 1)).all(), limit)
 
 # Function to get a product by ID
 def get_product(db: Session, product_id: str):
@@ -74,7 +145,7 @@ def get_product(db: Session, product_id: str):
     - **Returns**:
         - The product if found, otherwise None.
     """
-    return db.query(Product).filter(Product.id == product_id).first()
+    return db.scalar(select(Product).where(Product.id == product_id))
 
 # Function to update a product
 def update_product(db: Session, product_id: str, product: ProductCreate):
@@ -87,25 +158,29 @@ def update_product(db: Session, product_id: str, product: ProductCreate):
         - `product`: ProductCreate schema containing updated product details.
 
     - **Returns**:
-        - The updated product.
+        - The updated product, read back through `UPDATE ... RETURNING`.
 
     - **Raises**:
         - ValueError: If the product is not found.
     """
-    db_product = db.query(Product).filter(Product.id == product_id).first()
+    # Updates product fields
+    db_product = db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(
+            name=product.name,
+            description=product.description,
+            price=product.price,
+            stock_quantity=product.stock_quantity,
+            image_url=product.image_url,
+            category_id=product.category_id,
+        )
+        .returning(Product)
+    ).scalar_one_or_none()
     if not db_product:
         raise ValueError("Product not found")
 
-    # Updates product fields
-    db_product.name = product.name
-    db_product.description = product.description
-    db_product.price = product.price
-    db_product.stock_quantity = product.stock_quantity
-    db_product.image_url = product.image_url
-    db_product.category_id = product.category_id
-
     db.commit()
-    db.refresh(db_product)
 
     return db_product
 
@@ -119,20 +194,50 @@ def delete_product(db: Session, product_id: str):
         - `product_id`: ID of the product to delete.
 
     - **Returns**:
-        - The deleted product.
+        - The deleted product, read back through `DELETE ... RETURNING`.
 
     - **Raises**:
         - ValueError: If the product is not found.
     """
-    db_product = db.query(Product).filter(Product.id == product_id).first()
+    db_product = db.execute(
+        delete(Product).where(Product.id == product_id).returning(Product)
+    ).scalar_one_or_none()
     if not db_product:
         raise ValueError("Product not found")
 
-    db.delete(db_product)
     db.commit()
 
     return db_product
 
+# Function to apply a stock change atomically
+def apply_stock_change(db: Session, product_id: str, delta: int, required: int = 0):
+    """
+    Adds `delta` to a product's stock with a single conditional UPDATE.
+
+    The check and the write happen in one statement, so concurrent exits can never
+    oversell: the database only updates the row if it still holds `required` units.
+
+    - **Parameters**:
+        - `db`: Database session.
+        - `product_id`: ID of the product whose stock changes.
+        - `delta`: Units to add (negative to remove).
+        - `required`: Minimum stock the product must hold for the change to apply.
+
+    - **Raises**:
+        - ValueError: If the product is not found or if there is insufficient stock.
+    """
+    updated_id = db.execute(
+        update(Product)
+        .where(Product.id == product_id, Product.stock_quantity >= required)
+        .values(stock_quantity=Product.stock_quantity + delta)
+        .returning(Product.id)
+    ).scalar_one_or_none()
+    if updated_id is None:
+        # Only failed updates pay for the lookup that tells the two errors apart
+        if db.scalar(select(Product.id).where(Product.id == product_id)) is None:
+            raise ValueError("Product not found")
+        raise ValueError("Insufficient stock quantity")
+
 # Function to create a stock movement
 def create_inventory_transaction(
         db: Session, product_id: str, transaction: InventoryTransactionCreate, user_id: str
@@ -140,71 +245,132 @@ def create_inventory_transaction(
     """
     Creates a new inventory transaction for a product.
 
+    The stock change and the new transaction are committed together, so a failed
+    transaction never leaves a movement without its stock change (or vice versa).
+
     - **Parameters**:
         - `db`: Database session.
         - `product_id`: ID of the product associated with the transaction.
         - `transaction`: InventoryTransactionCreate schema containing transaction details.
-        - `user_id`: ID of the user creating the transaction.
+        - `user_id`: ID of the user creating the transaction (not stored, transactions have no user column).
 
     - **Returns**:
-        - The newly created inventory transaction.
+        - The newly created inventory transaction, read back through `INSERT ... RETURNING`.
 
     - **Raises**:
         - ValueError: If the product is not found or if there is insufficient stock for an "exit" transaction.
     """
-    # Check if the product exists
-    db_product = db.query(Product).filter(Product.id == product_id).first()
-    if not db_product:
-        raise ValueError("Product not found")
+    # Updates the product's stock quantity
+    if transaction.type == TransactionType.EXIT:
+        apply_stock_change(db, product_id, -transaction.quantity, required=transaction.quantity)
+    else:
+        apply_stock_change(db, product_id, transaction.quantity)
 
     # Creates inventory movement
-    new_transaction = InventoryTransaction(
-        product_id=product_id,
-        type=transaction.type,
-        quantity=transaction.quantity,
-        description=transaction.description,
-        user_id=user_id,
-    )
-    db.add(new_transaction)
+    new_transaction = db.execute(
+        insert(InventoryTransaction)
+        .values(
+            product_id=product_id,
+            type=transaction.type,
+            quantity=transaction.quantity,
+            description=transaction.description,
+        )
+        .returning(InventoryTransaction)
+    ).scalar_one()
     db.commit()
-    db.refresh(new_transaction)
 
-    # Updates the product's stock quantity
-    if transaction.type == "entry":
-        db_product.stock_quantity += transaction.quantity
-    elif transaction.type == "exit":
-        if db_product.stock_quantity < transaction.quantity:
-            raise ValueError("Insufficient stock quantity")
-        db_product.stock_quantity -= transaction.quantity
+    return new_transaction
+
+# Function to create several stock movements at once
+def create_inventory_transactions(
+        db: Session, product_id: str, transactions: List[InventoryTransactionCreate], user_id: str
+):
+    """
+    Creates several inventory transactions for a product with a single multi-row insert.
+
+    The transactions are applied in order, and the product's stock must never drop
+    below zero along the way. Nothing is written if any of them fails.
+
+    - **Parameters**:
+        - `db`: Database session.
+        - `product_id`: ID of the product associated with the transactions.
+        - `transactions`: List of InventoryTransactionCreate schemas containing transaction details.
+        - `user_id`: ID of the user creating the transactions (not stored, transactions have no user column).
+
+    - **Returns**:
+        - The newly created inventory transactions, read back through `INSERT ... RETURNING`.
 
+    - **Raises**:
+        - ValueError: If no transactions are given, if the product is not found or if there is
+          insufficient stock for an "exit" transaction.
+    """
+    if not transactions:
+        raise ValueError("No transactions provided")
+
+    # Net stock change, and the stock needed so the running total never goes negative
+    delta = 0
+    required = 0
+    for transaction in transactions:
+        if transaction.type == TransactionType.EXIT:
+            delta -= transaction.quantity
+            required = max(required, -delta)
+        else:
+            delta += transaction.quantity
+
+    # Updates the product's stock quantity
+    apply_stock_change(db, product_id, delta, required=required)
+
+    # Creates all inventory movements in one round-trip
+    new_transactions = db.execute(
+        insert(InventoryTransaction)
+        .values([
+            dict(
+                product_id=product_id,
+                type=transaction.type,
+                quantity=transaction.quantity,
+                description=transaction.description,
+            )
+            for transaction in transactions
+        ])
+        .returning(InventoryTransaction)
+    ).scalars().all()
     db.commit()
-    db.refresh(db_product)
 
-    return new_transaction
+    return new_transactions
 
 # Function to list all stock movements of a product
 def get_inventory_transactions(
-        db: Session, product_id: str, skip: int = 0, limit: int = 100
+        db: Session, product_id: str, cursor: Optional[str] = None, limit: int = 100
 ):
     """
-    Retrieves a list of inventory transactions for a specific product.
+    Retrieves a page of inventory transactions for a specific product, newest first.
+
+    Uses keyset pagination on `(date_transaction, id)` within the product.
 
     - **Parameters**:
         - `db`: Database session.
         - `product_id`: ID of the product to retrieve transactions for.
-        - `skip`: Number of transactions to skip (for pagination).
+        - `cursor`: Cursor of the last transaction of the previous page (see `app.utils.pagination`).
         - `limit`: Maximum number of transactions to return (for pagination).
 
     - **Returns**:
-        - A list of inventory transactions.
-    """
-    return (
-        db.query(InventoryTransaction)
-        .filter(InventoryTransaction.product_id == product_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+        - A page dict with the transactions, `has_more` and `next_cursor` (see `app.utils.pagination.page`).
+
+    - **Raises**:
+        - ValueError: If the cursor is invalid.
+    """
+    stmt = (
+        select(InventoryTransaction)
+        .where(InventoryTransaction.product_id == product_id)
+        .order_by(InventoryTransaction.date_transaction.desc(), InventoryTransaction.id.desc())
     )
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(InventoryTransaction.date_transaction, InventoryTransaction.id)
+            < tuple_(last_date, last_id)
+        )
+    return page(db.scalars(stmt.limit(limit + 1)).all(), limit, "date_transaction")
 
 # Function to get a specific stock movement
 def get_inventory_transaction(db: Session, product_id: str, transaction_id: str):
@@ -219,9 +385,8 @@ def get_inventory_transaction(db: Session, product_id: str, transaction_id: str)
     - **Returns**:
         - The inventory transaction if found, otherwise None.
     """
-    return (
-        db.query(InventoryTransaction)
-        .filter(
+    return db.scalar(
+        select(InventoryTransaction).where(
             InventoryTransaction.product_id == product_id,
             InventoryTransaction.id == transaction_id,
         )
@@ -237,41 +402,48 @@ def create_category(db: Session, category: CategoryCreate):
         - `category`: CategoryCreate schema containing category details.
 
     - **Returns**:
-        - The newly created category.
+        - The newly created category, read back through `INSERT ... RETURNING`.
 
     - **Raises**:
-        - ValueError: If the category already exists.
+        - CategoryAlreadyExistsError: If the category already exists.
     """
-    # Checks if category already exists
-    db_category = db.query(Category).filter(Category.name == category.name).first()
-    if db_category:
-        raise ValueError("Category already exists")
-
-    # Create the category
-    new_category = Category(
-        name=category.name,
-        description=category.description,
-    )
-    db.add(new_category)
+    # Create the category, the UNIQUE constraint on the name rejects duplicates
+    try:
+        new_category = db.execute(
+            insert(Category)
+            .values(name=category.name, description=category.description)
+            .returning(Category)
+        ).scalar_one()
+    except IntegrityError:
+        db.rollback()
+        raise CategoryAlreadyExistsError("Category already exists")
     db.commit()
-    db.refresh(new_category)
 
     return new_category
 
 # Function to list all categories
-def get_categories(db: Session, skip: int = 0, limit: int = 100):
+def get_categories(db: Session, cursor: Optional[str] = None, limit: int = 100):
     """
-    Retrieves a list of categories from the database.
+    Retrieves a page of categories from the database, newest first.
+
+    Uses keyset pagination on `(date_creation, id)`, like `get_products`.
 
     - **Parameters**:
         - `db`: Database session.
-        - `skip`: Number of categories to skip (for pagination).
+        - `cursor`: Cursor of the last category of the previous page (see `app.utils.pagination`).
         - `limit`: Maximum number of categories to return (for pagination).
 
     - **Returns**:
-        - A list of categories.
+        - A page dict with the categories, `has_more` and `next_cursor` (see `app.utils.pagination.page`).
+
+    - **Raises**:
+        - ValueError: If the cursor is invalid.
     """
-    return db.query(Category).offset(skip).limit(limit).all()
+    stmt = select(Category).order_by(Category.date_creation.desc(), Category.id.desc())
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Category.date_creation, Category.id) < tuple_(last_date, last_id))
+    return page(db.scalars(stmt.limit(limit + 1)).all(), limit)
 
 # Function to get a specific category
 def get_category(db: Session, category_id: str):
@@ -285,7 +457,7 @@ def get_category(db: Session, category_id: str):
     - **Returns**:
         - The category if found, otherwise None.
     """
-    return db.query(Category).filter(Category.id == category_id).first()
+    return db.scalar(select(Category).where(Category.id == category_id))
 
 # Function to update a category
 def update_category(db: Session, category_id: str, category: CategoryCreate):
@@ -298,21 +470,27 @@ def update_category(db: Session, category_id: str, category: CategoryCreate):
         - `category`: CategoryCreate schema containing updated category details.
 
     - **Returns**:
-        - The updated category.
+        - The updated category, read back through `UPDATE ... RETURNING`.
 
     - **Raises**:
         - ValueError: If the category is not found.
+        - CategoryAlreadyExistsError: If another category already has the name.
     """
-    db_category = db.query(Category).filter(Category.id == category_id).first()
+    # Updates category fields
+    try:
+        db_category = db.execute(
+            update(Category)
+            .where(Category.id == category_id)
+            .values(name=category.name, description=category.description)
+            .returning(Category)
+        ).scalar_one_or_none()
+    except IntegrityError:
+        db.rollback()
+        raise CategoryAlreadyExistsError("Category already exists")
     if not db_category:
         raise ValueError("Category not found")
 
-    # Updates category fields
-    db_category.name = category.name
-    db_category.description = category.description
-
     db.commit()
-    db.refresh(db_category)
 
     return db_category
 
@@ -326,16 +504,17 @@ def delete_category(db: Session, category_id: str):
         - `category_id`: ID of the category to delete.
 
     - **Returns**:
-        - The deleted category.
+        - The deleted category, read back through `DELETE ... RETURNING`.
 
     - **Raises**:
         - ValueError: If the category is not found.
     """
-    db_category = db.query(Category).filter(Category.id == category_id).first()
+    db_category = db.execute(
+        delete(Category).where(Category.id == category_id).returning(Category)
+    ).scalar_one_or_none()
     if not db_category:
         raise ValueError("Category not found")
 
-    db.delete(db_category)
     db.commit()
 
     return db_category
@@ -1,29 +1,62 @@
 from datetime import datetime, timedelta, UTC
 from typing import Optional
-from jose import JWTError, jwt
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.database.connection import get_db
 from app.database.models import User
 from dotenv import load_dotenv
+import asyncio
+import hashlib
+import hmac
 import os
+import threading
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Security Settings
-SECRET_KEY = os.getenv("SECRET_KEY") # Secret key for JWT encoding/decoding
-ALGORITHM = os.getenv("ALGORITHM") # Algorithm used for JWT encoding/decoding
-ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES") # Token expiration time
+# Security Settings, read and converted once (a missing variable fails at startup, not per request)
+SECRET_KEY: str = os.environ["SECRET_KEY"] # Secret key for JWT encoding/decoding
+ALGORITHM: str = os.environ["ALGORITHM"] # Algorithm used for JWT encoding/decoding
+ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.environ["ACCESS_TOKEN_EXPIRE_MINUTES"]) # Token expiration time
+
+# Signing key parsed once, instead of on every token encode/decode
+JWT_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
 
 # Setting the encryption context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Argon2id with the OWASP minimum parameters; bcrypt is kept so existing hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456, # 19 MiB
+    argon2__parallelism=1,
+)
+
+# Dedicated workers for password hashing, so Argon2 never occupies the threads serving database I/O
+# (argon2-cffi and bcrypt release the GIL while hashing, so threads run them in parallel)
+HASH_WORKERS = max((os.cpu_count() or 2) - 1, 1)
+hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
 
 # OAuth2 Configuration
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Short-lived cache of authenticated users, keyed by a hash of the JWT token
+user_cache = TTLCache(maxsize=10_000, ttl=30)
+user_cache_lock = threading.Lock() # Sync dependencies run in several threads
+
+# Short-lived record of successful logins, so repeated logins skip Argon2
+# Keys are an HMAC of the stored hash and the password: plaintext passwords are never kept,
+# and changing the password changes the stored hash, which invalidates the entry
+login_cache = TTLCache(maxsize=10_000, ttl=60) # Only used from the event loop, so no lock
+
 # Function to check password
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -51,22 +84,96 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+# Function to check password without blocking the event loop
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a password in the hashing executor so the event loop keeps serving requests.
+
+    - **Parameters**:
+        - `plain_password`: The plain text password to verify.
+        - `hashed_password`: The hashed password to compare against.
+
+    - **Returns**:
+        - `True` if the passwords match, otherwise `False`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, verify_password, plain_password, hashed_password)
+
+# Function to generate the password hash without blocking the event loop
+async def hash_password_async(password: str) -> str:
+    """
+    Generates a password hash in the hashing executor so the event loop keeps serving requests.
+
+    - **Parameters**:
+        - `password`: The plain text password to hash.
+
+    - **Returns**:
+        - The hashed password.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, get_password_hash, password)
+
+# Function to get a user by email
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """
+    Retrieves a user by their email address.
+
+    - **Parameters**:
+        - `db`: Database session.
+        - `email`: The email of the user to retrieve.
+
+    - **Returns**:
+        - The user if found, otherwise `None`.
+    """
+    return db.scalar(select(User).where(User.email == email))
+
+# Function to get the login credentials of a user by email
+def get_user_credentials(db: Session, email: str) -> Optional[Row]:
+    """
+    Retrieves only the columns needed to check a login, instead of the full user row.
+
+    - **Parameters**:
+        - `db`: Database session.
+        - `email`: The email of the user to retrieve.
+
+    - **Returns**:
+        - A row with `id`, `email` and `password` if found, otherwise `None`.
+    """
+    return db.execute(
+        select(User.id, User.email, User.password).where(User.email == email)
+    ).first()
+
 # Function to authenticate the user
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[Row]:
     """
     Authenticates a user by checking their email and password.
 
+    The user lookup runs in the threadpool and the password verification in the
+    hashing executor, so neither the database round-trip nor the hashing blocks the event loop.
+    Successful logins are remembered for 60 seconds (see `login_cache`); failed ones are
+    never cached, so guessing passwords always pays the full hashing cost.
+
     - **Parameters**:
         - `db`: Database session.
         - `email`: The email of the user to authenticate.
         - `password`: The password of the user to authenticate.
 
     - **Returns**:
-        - The authenticated user if successful, otherwise `None`.
+        - The `id`, `email` and `password` row of the user if successful, otherwise `None`.
     """
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password):
+    user = await run_in_threadpool(get_user_credentials, db, email)
+    if not user:
         return None
+
+    cache_key = hmac.new(
+        SECRET_KEY.encode(), f"{user.password}\0{password}".encode(), hashlib.sha256
+    ).digest()
+    if cache_key in login_cache:
+        return user
+
+    if not await verify_password_async(password, user.password):
+        return None
+    login_cache[cache_key] = True
     return user
 
 # Function to create the JWT token
@@ -76,7 +183,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
     - **Parameters**:
         - `data`: A dictionary containing the data to encode in the token (e.g., user email).
-        - `expires_delta`: Optional timedelta for token expiration. Defaults to 15 minutes.
+        - `expires_delta`: Optional timedelta for token expiration. Defaults to `ACCESS_TOKEN_EXPIRE_MINUTES`.
 
     - **Returns**:
         - The encoded JWT token.
@@ -85,9 +192,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
     else:
-        expire = datetime.now(UTC) + timedelta(minutes=15)
+        expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 # Function to get the current user
@@ -106,21 +213,36 @@ def get_current_user(
 
     - **Raises**:
         - HTTPException (401): If the token is invalid or the user is not found.
+
+    - **Caching**:
+        - The resolved user is cached for up to 30 seconds (never past the token's
+          expiration), skipping the JWT decode and the database lookup on repeated calls.
     """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with user_cache_lock:
+        cached = user_cache.get(cache_key)
+    if cached is not None and cached[1] > datetime.now(UTC).timestamp():
+        return cached[0]
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Unable to validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, JWT_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_by_email(db, email)
     if user is None:
         raise credentials_exception
+
+    # Detach the user so the cached instance outlives this request's session
+    db.expunge(user)
+    with user_cache_lock:
+        user_cache[cache_key] = (user, payload.get("exp", 0))
     return user
@@ -0,0 +1,49 @@
+from cachetools import TTLCache
+import threading
+
+# Short-lived caches of serialized responses, keyed by the query parameters (lists) or the ID (single items)
+products_cache = TTLCache(maxsize=1024, ttl=30)
+categories_cache = TTLCache(maxsize=1024, ttl=30)
+cache_lock = threading.Lock()
+
+# Function to read a cached response body
+def cache_get(cache: TTLCache, key):
+    """
+    Retrieves a cached response body.
+
+    - **Parameters**:
+        - `cache`: The cache to read from.
+        - `key`: The cache key (the query parameters or the ID of the request).
+
+    - **Returns**:
+        - The cached JSON bytes, or None if the key is missing or expired.
+    """
+    with cache_lock:
+        return cache.get(key)
+
+# Function to store a response body
+def cache_set(cache: TTLCache, key, content: bytes):
+    """
+    Stores a response body in a cache.
+
+    - **Parameters**:
+        - `cache`: The cache to write to.
+        - `key`: The cache key (the query parameters or the ID of the request).
+        - `content`: The JSON bytes to cache.
+    """
+    with cache_lock:
+        cache[key] = content
+
+# Function to invalidate a cache after a write
+def cache_clear(cache: TTLCache):
+    """
+    Removes every entry from a cache.
+
+    The caches live in each worker process, so other workers may keep serving
+    their entries until the TTL expires.
+
+    - **Parameters**:
+        - `cache`: The cache to clear.
+    """
+    with cache_lock:
+        cache.clear()
@@ -1,6 +1,7 @@
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
 from fastapi import Response
+from typing import Optional
+import orjson
 
 # Dictionary of error messages for each status code
 ERROR_MESSAGES = {
@@ -18,202 +19,80 @@ ERROR_MESSAGES = {
     504: "Gateway Timeout"
 }
 
-# Standard error response format
-def error_response(status_code: int, message: str):
+# Standard error body format
+def error_body(status_code: int, message: str) -> bytes:
     """
-    Generates a standardized error response in JSON format.
+    Encodes the standardized error body to JSON.
 
     - **Parameters**:
         - `status_code`: The HTTP status code for the error.
         - `message`: A descriptive message about the error.
 
     - **Returns**:
-        - A JSONResponse containing the error details.
-    """
-    return JSONResponse(
-        status_code=status_code,
-        content={
-            "error": ERROR_MESSAGES.get(status_code, "Unknown Error"),
-            "message": message,
-            "status_code": status_code
-        }
-    )
-
-"""
-4xx Errors (Client side)
-"""
-
-# Error 400 (Bad Request)
-async def bad_request_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 400 Bad Request errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 400 errors.
-    """
-    return error_response(400, str(exc))
-
-# Error 401 (Unauthorized)
-async def unauthorized_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 401 Unauthorized errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 401 errors.
-    """
-    return error_response(401, str(exc))
-
-# Error 403 (Forbidden)
-async def forbidden_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 403 Forbidden errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 403 errors.
-    """
-    return error_response(403, str(exc))
-
-# Error 404 (Not Found)
-async def not_found_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 404 Not Found errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 404 errors.
-    """
-    return error_response(404, str(exc))
-
-# Error 405 (Method Not Allowed)
-async def method_not_allowed_handler(request: Request, exc: Exception) -> Response:
+        - The JSON encoded error details.
     """
-    Handles 405 Method Not Allowed errors.
+    return orjson.dumps({
+        "error": ERROR_MESSAGES.get(status_code, "Unknown Error"),
+        "message": message,
+        "status_code": status_code
+    })
 
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
+# Bodies of the handlers with a fixed message, encoded once at import
+INTERNAL_SERVER_ERROR_BODY = error_body(500, "An unexpected error occurred.")
+UNKNOWN_ERROR_BODY = error_body(500, "An unknown error occurred.")
 
-    - **Returns**:
-        - A standardized error response for 405 errors.
-    """
-    return error_response(405, str(exc))
-
-# Error 408 (Request Timeout)
-async def request_timeout_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 408 Request Timeout errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 408 errors.
-    """
-    return error_response(408, str(exc))
-
-# Error 409 (Conflict)
-async def conflict_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 409 Conflict errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 409 errors.
-    """
-    return error_response(409, str(exc))
-
-# Error 429 (Too Many Requests)
-async def too_many_requests_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 429 Too Many Requests errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 429 errors.
-    """
-    return error_response(429, str(exc))
-
-"""
-5xx Errors (Server side)
-"""
-
-# Error 500 (Internal Server Error)
-async def internal_server_error_handler(request: Request, exc: Exception) -> Response:
-    """
-    Handles 500 Internal Server Error errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
-
-    - **Returns**:
-        - A standardized error response for 500 errors.
-    """
-    return error_response(500, "An unexpected error occurred.")
-
-# Error 502 (Bad Gateway)
-async def bad_gateway_handler(request: Request, exc: Exception) -> Response:
+# Standard error response format
+def error_response(status_code: int, message: str, body: Optional[bytes] = None) -> Response:
     """
-    Handles 502 Bad Gateway errors.
+    Generates a standardized error response in JSON format.
 
     - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
+        - `status_code`: The HTTP status code for the error.
+        - `message`: A descriptive message about the error.
+        - `body`: Optional pre-encoded body, used instead of encoding `message`.
 
     - **Returns**:
-        - A standardized error response for 502 errors.
-    """
-    return error_response(502, str(exc))
-
-# Error 503 (Service Unavailable)
-async def service_unavailable_handler(request: Request, exc: Exception) -> Response:
+        - A Response containing the JSON encoded error details.
     """
-    Handles 503 Service Unavailable errors.
-
-    - **Parameters**:
-        - `request`: The incoming request.
-        - `exc`: The exception that triggered the error.
+    return Response(
+        content=body if body is not None else error_body(status_code, message),
+        status_code=status_code,
+        media_type="application/json",
+    )
 
-    - **Returns**:
-        - A standardized error response for 503 errors.
-    """
-    return error_response(503, str(exc))
+# Status codes handled by `http_error_handler`, with the fixed body each one sends
+# (None: the message is taken from the exception)
+HANDLED_ERRORS = {
+    # 4xx Errors (Client side)
+    400: None,
+    401: None,
+    403: None,
+    404: None,
+    405: None,
+    408: None,
+    409: None,
+    429: None,
+    # 5xx Errors (Server side)
+    500: INTERNAL_SERVER_ERROR_BODY,
+    502: None,
+    503: None,
+    504: None,
+}
 
-# Error 504 (Gateway Timeout)
-async def gateway_timeout_handler(request: Request, exc: Exception) -> Response:
+# Handler for every status code in HANDLED_ERRORS
+async def http_error_handler(request: Request, exc: Exception) -> Response:
     """
-    Handles 504 Gateway Timeout errors.
+    Handles the errors listed in `HANDLED_ERRORS`.
 
     - **Parameters**:
         - `request`: The incoming request.
         - `exc`: The exception that triggered the error.
 
     - **Returns**:
-        - A standardized error response for 504 errors.
+        - A standardized error response for the exception's status code (500 if it has none).
     """
-    return error_response(504, str(exc))
+    status_code = getattr(exc, "status_code", 500)
+    return error_response(status_code, str(exc), HANDLED_ERRORS.get(status_code))
 
 # Generic handler for unknown errors
 async def unknown_error_handler(request: Request, exc: Exception) -> Response:
@@ -227,4 +106,4 @@ async def unknown_error_handler(request: Request, exc: Exception) -> Response:
     - **Returns**:
         - A standardized error response for unknown errors.
     """
-    return error_response(500, "An unknown error occurred.")
+    return error_response(500, "An unknown error occurred.", UNKNOWN_ERROR_BODY)
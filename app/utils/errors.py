@@ -87,6 +87,16 @@ async def too_many_requests_error():
     """
     raise HTTPException(status_code=429, detail="Too Many Requests")
 
+@router.get("/teapot")
+async def unhandled_status_error():
+    """
+    Simulates an error whose status code has no handler of its own.
+
+    - **Raises**:
+        - HTTPException (418): With the detail "I'm a teapot".
+    """
+    raise HTTPException(status_code=418, detail="I'm a teapot")
+
 """
 5xx Errors (Server side)
 """
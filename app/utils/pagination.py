@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+import base64
+
+# Largest page size the list endpoints accept
+MAX_PAGE_SIZE = 1000
+
+# Function to encode a keyset pagination cursor
+def encode_cursor(last_date: datetime, last_id: UUID) -> str:
+    """
+    Encodes the sort key of the last row of a page into an opaque cursor.
+
+    - **Parameters**:
+        - `last_date`: Timestamp of the last row returned.
+        - `last_id`: ID of the last row returned (tie-breaker for equal timestamps).
+
+    - **Returns**:
+        - A URL-safe string to be sent back as the `cursor` of the next page.
+    """
+    raw = f"{last_date.isoformat()}|{last_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+# Function to decode a keyset pagination cursor
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    - **Parameters**:
+        - `cursor`: The opaque cursor received from the client.
+
+    - **Returns**:
+        - A tuple with the timestamp and ID of the last row of the previous page.
+
+    - **Raises**:
+        - ValueError: If the cursor is malformed.
+    """
+    try:
+        last_date, last_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(last_date), UUID(last_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+# Function to build a page from the rows of a keyset query
+def page(rows: list, limit: int, date_field: str = "date_creation") -> dict:
+    """
+    Builds a page from rows fetched with `LIMIT limit + 1`.
+
+    The extra row is never returned: it only tells whether a next page exists,
+    so callers never need a `COUNT(*)` and the last page never links to an empty one.
+
+    - **Parameters**:
+        - `rows`: Up to `limit + 1` rows, in keyset order.
+        - `limit`: The page size requested.
+        - `date_field`: Name of the timestamp attribute used as sort key.
+
+    - **Returns**:
+        - A dict with the `items` of the page, whether the next page `has_more` rows,
+          and the `next_cursor` to request it (`None` on the last page).
+    """
+    items = rows[:limit]
+    has_more = len(rows) > limit
+    cursor = None
+    if has_more and items:
+        cursor = encode_cursor(getattr(items[-1], date_field), items[-1].id)
+    return {"items": items, "has_more": has_more, "next_cursor": cursor}
@@ -1,30 +1,45 @@
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
-from app.database.connection import engine, Base
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+import os
+from app.database.connection import WARM_POOL, warm_pool
 from app.api.v1 import auth
 from app.api.v1 import inventory
 from app.utils.errors import router as errors_router
 from app.utils.error_handlers import (
-    bad_request_handler,
-    unauthorized_handler,
-    forbidden_handler,
-    not_found_handler,
-    method_not_allowed_handler,
-    request_timeout_handler,
-    conflict_handler,
-    too_many_requests_handler,
-    internal_server_error_handler,
-    bad_gateway_handler,
-    service_unavailable_handler,
-    gateway_timeout_handler,
+    HANDLED_ERRORS,
+    http_error_handler,
     unknown_error_handler
 )
 
+# Number of worker threads available to sync endpoints and threadpool calls
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))
+
+# Application lifespan (startup and shutdown)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Configures the application on startup.
+
+    - **Startup**:
+        - Sizes the threadpool used by sync endpoints, so concurrency is bounded
+          by the database connection pool instead of AnyIO's default of 40 threads.
+        - Warms the database connection pool, if enabled with `DB_WARM_POOL=true`.
+    """
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if WARM_POOL:
+        await run_in_threadpool(warm_pool)
+    yield
+
 # Create the FastAPI application
 app = FastAPI(
     title="Inventory Management APi",
     description="API for product inventory management",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse, # orjson encodes UUID and datetime natively
 )
 
 # Exception handler to format errors in a custom way
@@ -33,20 +48,24 @@ async def custom_http_exception_handler(request, exc: HTTPException):
     """
     Custom exception handler for HTTP errors.
 
+    Only receives the status codes without a handler of their own (see `HANDLED_ERRORS`),
+    such as an HTTPException raised with 500.
+
     - **Parameters**:
         - `request`: The incoming request.
         - `exc`: The HTTPException instance containing error details.
 
     - **Returns**:
-        - A JSONResponse with the error details formatted in a custom way.
+        - An ORJSONResponse with the exception's status code, headers and details.
     """
-    return JSONResponse(
-        status_code=500,
+    return ORJSONResponse(
+        status_code=exc.status_code,
         content={
             "error": exc.detail,
             "message": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        headers=exc.headers,
     )
 
 # Include error routers
@@ -54,9 +73,7 @@ app.include_router(errors_router, prefix="/api/v1")
 
 # Include inventory routers
 app.include_router(inventory.router, prefix="/api/v1")
-
-# Create tables in the database
-Base.metadata.create_all(bind=engine)
+app.include_router(inventory.categories_router, prefix="/api/v1")
 
 # Include auth routers
 app.include_router(auth.router, prefix="/api/v1")
@@ -73,18 +90,8 @@ def read_root():
     return {"message": "Hello World"}
 
 # Register error handlers
-app.add_exception_handler(400, bad_request_handler)
-app.add_exception_handler(401, unauthorized_handler)
-app.add_exception_handler(403, forbidden_handler)
-app.add_exception_handler(404, not_found_handler)
-app.add_exception_handler(405, method_not_allowed_handler)
-app.add_exception_handler(408, request_timeout_handler)
-app.add_exception_handler(409, conflict_handler)
-app.add_exception_handler(429, too_many_requests_handler)
-app.add_exception_handler(500, internal_server_error_handler)
-app.add_exception_handler(502, bad_gateway_handler)
-app.add_exception_handler(503, service_unavailable_handler)
-app.add_exception_handler(504, gateway_timeout_handler)
+for status_code in HANDLED_ERRORS:
+    app.add_exception_handler(status_code, http_error_handler)
 
 # Generic handler for unknown errors
 @app.exception_handler(Exception)
@@ -97,6 +104,6 @@ async def generic_exception_handler(request: Request, exc: Exception):
         - `exc`: The exception instance.
 
     - **Returns**:
-        - A JSONResponse with the error details formatted by the unknown_error_handler.
+        - A JSON response with the error details formatted by the unknown_error_handler.
     """
     return await unknown_error_handler(request, exc)
@@ -3,3 +3,14 @@ import os
 
 # Add project root directory to PYTHON PATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Function to configure the test run
+def pytest_configure(config):
+    """
+    Switches password hashing to the cheapest Argon2 and bcrypt parameters for the test run.
+
+    The tests check how passwords are hashed and verified, not the hashing cost, which
+    would otherwise dominate the unit tests.
+    """
+    from app.utils.auth import pwd_context
+    pwd_context.update(argon2__time_cost=1, argon2__memory_cost=8, bcrypt__rounds=4)
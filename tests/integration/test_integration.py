@@ -1,467 +1,668 @@
+import os
 import pytest
 import uuid
+from contextlib import contextmanager
+from datetime import timedelta
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, event, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from main import app
-from app.database.connection import SessionLocal, engine
-from app.utils.auth import create_access_token
+from app.database import connection
+from app.database.connection import get_db
+from app.utils.auth import create_access_token, user_cache
+from app.utils.cache import products_cache, categories_cache, cache_clear
 from app.database.models import Base, User, Category
 
+# Function to create an in-memory SQLite engine for the tests
+def get_sqlite_engine():
+    """
+    Creates an in-memory SQLite engine, shared by every session of the process.
+
+    `StaticPool` hands out the single connection that holds the database, and the
+    event hooks let pysqlite run the SAVEPOINTs of the per-test transaction
+    (by default it defers BEGIN and breaks nested transactions).
+
+    - **Returns**:
+        - The SQLAlchemy engine.
+    """
+    sqlite_engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False}, # The TestClient serves requests from other threads
+    )
+
+    @event.listens_for(sqlite_engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(sqlite_engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return sqlite_engine
+
+# Function to get the database engine of the current test worker
+def get_worker_engine():
+    """
+    Returns the engine the integration tests should use.
+
+    With `TEST_DB=sqlite`, the tests run against an in-memory SQLite database
+    (one per process, so also one per xdist worker) instead of PostgreSQL.
+
+    Under pytest-xdist (`pytest -n auto`), each worker gets its own
+    database, named after the configured one plus the worker ID (e.g. `inventory_gw0`),
+    so parallel workers never create or drop each other's tables. The database is
+    created on first use. Without xdist, the configured engine is used as is.
+
+    - **Returns**:
+        - The SQLAlchemy engine of this worker.
+    """
+    if os.environ.get("TEST_DB") == "sqlite":
+        return get_sqlite_engine()
+
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker_id is None:
+        return connection.engine
+
+    database = f"{connection.DB_NAME}_{worker_id}"
+    with connection.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        exists = conn.scalar(text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": database})
+        if not exists:
+            conn.execute(text(f'CREATE DATABASE "{database}"'))
+    return create_engine(connection.engine.url.set(database=database), pool_pre_ping=True)
+
+# Function to count the SQL queries run on an engine
+@contextmanager
+def count_queries(bind):
+    """
+    Records the SQL statements executed on `bind` while the block runs.
+
+    Transaction control (the savepoints of the per-test transaction) is not recorded,
+    so the count only holds the queries issued by the code under test.
+
+    - **Parameters**:
+        - `bind`: The engine (or connection) to listen on.
+
+    - **Yields**:
+        - The list of executed statements, filled as the block runs.
+    """
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")):
+            queries.append(statement)
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+# Fixture to create the tables of this test worker
+@pytest.fixture(scope="session")
+def test_engine():
+    """
+    Fixture to create the test schema once per test run (per worker under xdist).
+
+    - **Yields**:
+        - The SQLAlchemy engine of this worker, with all tables created.
+
+    - **Cleans up**:
+        - Drops all tables and disposes of the worker's engine.
+    """
+    worker_engine = get_worker_engine()
+    Base.metadata.create_all(bind=worker_engine)
+    yield worker_engine
+    Base.metadata.drop_all(bind=worker_engine)
+    if worker_engine is not connection.engine:
+        worker_engine.dispose()
+
 # Fixture to create database session
-@pytest.fixture
-def db_session():
+@pytest.fixture(autouse=True)
+def db_session(test_engine):
     """
-    Fixture to create a database session for testing.
+    Fixture to create a database session for every test, inside a transaction rolled back after the test.
+
+    The application's sessions (through an override of `get_db`) use the same connection,
+    and every commit only releases a SAVEPOINT, so nothing a test writes outlives it.
+
+    - **Parameters**:
+        - `test_engine`: The engine of this worker.
 
     - **Yields**:
         - A database session for use in tests.
 
     - **Cleans up**:
-        - Drops all tables after the test to ensure a clean state.
+        - Rolls back the outer transaction to ensure a clean state.
     """
-    # Creates a new database session
-    db = SessionLocal()
+    db_connection = test_engine.connect()
+    transaction = db_connection.begin()
+    factory = sessionmaker(
+        bind=db_connection,
+        join_transaction_mode="create_savepoint",
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    # Points the application's sessions at the same transaction
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    db = factory()
     try:
-        # Creates the tables in the database to ensure they exist
-        Base.metadata.create_all(bind=db.bind)
         yield db  # Session will be provided for testing
     finally:
         db.close()  # Close the session after the test
-        # Optional: Cleans up tables after testing to ensure the database is clean
-        Base.metadata.drop_all(bind=db.bind)
+        app.dependency_overrides.pop(get_db, None)
+        # Discards everything the test wrote
+        transaction.rollback()
+        db_connection.close()
+        # Forget users authenticated against the rolled back rows
+        user_cache.clear()
+        # Forget responses cached from the rolled back rows
+        cache_clear(products_cache)
+        cache_clear(categories_cache)
 
 # Test client creation
 @pytest.fixture(scope="module")
-def client():
+def client(test_engine):
     """
     Fixture to create a test client for the FastAPI application.
 
+    - **Parameters**:
+        - `test_engine`: The engine of this worker (ensures the tables exist).
+
     - **Yields**:
         - A TestClient instance for making HTTP requests.
-
-    - **Cleans up**:
-        - Drops all tables after the test to ensure a clean state.
     """
-    # Create tables in the database for testing
-    Base.metadata.create_all(bind=engine)
-
     # Instantiate the test client
     with TestClient(app) as client:
         yield client
 
-    # Cleaning the database after testing
-    Base.metadata.drop_all(bind=engine)
-
-# Fixture to create a test user
-@pytest.fixture
-def create_test_user(db_session):
+# Fixture to create the test user shared by the module
+@pytest.fixture(scope="module")
+def create_test_user(test_engine):
     """
-    Fixture to create a test user in the database.
+    Fixture to create a test user in the database, once per module.
+
+    The user is committed outside the per-test transaction, so a single insert serves
+    every test; rows the tests change are rolled back by `db_session`.
 
     - **Parameters**:
-        - `db_session`: Database session.
+        - `test_engine`: The engine of this worker.
 
-    - **Returns**:
-        - A tuple containing a mocked access token and the created user.
+    - **Yields**:
+        - The created user.
+
+    - **Cleans up**:
+        - Deletes the user.
     """
     user = User(name="Test User", email="testuser@example.com", password="password")
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    access_token = "mocked_token"  # # A valid token must be generated here using the authentication method
-    return access_token, user
-
-# Fixture to create a category in the database
-@pytest.fixture
-def create_category(db_session):
+    with Session(test_engine, expire_on_commit=False) as db:
+        db.add(user)
+        db.commit()
+    yield user
+    with Session(test_engine) as db:
+        db.execute(delete(User).where(User.id == user.id))
+        db.commit()
+
+# Fixture to create the authentication headers of the test user
+@pytest.fixture(scope="module")
+def auth_headers(create_test_user):
     """
-    Fixture to create a test category in the database.
+    Fixture to sign one access token for the test user, once per module.
 
     - **Parameters**:
-        - `db_session`: Database session.
+        - `create_test_user`: The test user.
 
     - **Returns**:
-        - The created category.
+        - The `Authorization` header carrying a bearer token valid for one hour.
     """
-    category = Category(id=uuid.uuid4(), name="Test Category", description="A test category")
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
+    access_token = create_access_token(data={"sub": create_test_user.email}, expires_delta=timedelta(hours=1))
+    return {"Authorization": f"Bearer {access_token}"}
 
-def test_create_product(client, create_test_user, create_category):
+# Fixture to create the category shared by the module
+@pytest.fixture(scope="module")
+def create_category(test_engine):
     """
-   Test the creation of a product.
+    Fixture to create a test category in the database, once per module.
 
-   - **Steps**:
-       1. Creates a test user and generates an access token.
-       2. Creates a test category.
-       3. Sends a POST request to create a new product.
-       4. Verifies if the response status is 200 (OK).
-   """
-    # The first item in the tuple is the token, the second is the user
-    access_token, test_user = create_test_user  # Accessing the user
+    - **Parameters**:
+        - `test_engine`: The engine of this worker.
 
-    # It is now possible to access the user's email.
-    access_token = create_access_token(data={"sub": test_user.email})  # Using the user's email
+    - **Yields**:
+        - The created category.
 
-    # Debug: Check token value
-    print(f"Access Token: {access_token}")
+    - **Cleans up**:
+        - Deletes the category.
+    """
+    # Not "Test Category", which test_create_category creates through the API
+    category = Category(name="Fixture Category", description="A test category")
+    with Session(test_engine, expire_on_commit=False) as db:
+        db.add(category)
+        db.commit()
+    yield category
+    with Session(test_engine) as db:
+        db.execute(delete(Category).where(Category.id == category.id))
+        db.commit()
+
+# Fixture to build product payloads
+@pytest.fixture(scope="module")
+def product_payload(create_test_user, create_category):
+    """
+    Fixture to build the JSON payload of a test product.
 
-    # Use the category directly
-    category = create_category
+    - **Parameters**:
+        - `create_test_user`: The test user.
+        - `create_category`: The test category.
 
-    # Data for the new product
-    product_data = {
+    - **Returns**:
+        - A factory returning a new payload dict for a product of the test user and category,
+          with any field overridden by its keyword arguments.
+    """
+    base = {
         "name": "Test Product",
         "description": "This is a test product",
         "price": 100.0,
         "stock_quantity": 50,
         "image_url": "http://example.com/product.jpg",
-        "category_id": str(category.id),  # Using the created category ID
-        "user_id": str(test_user.id)  # Adding the user ID
+        "category_id": str(create_category.id),
+        "user_id": str(create_test_user.id),
     }
+    return lambda **overrides: {**base, **overrides}
 
-    headers = {"Authorization": f"Bearer {access_token}"}
+def test_create_product(client, product_payload, auth_headers):
+    """
+   Test the creation of a product.
 
-    response = client.post("/api/v1/products/", json=product_data, headers=headers)
+   - **Steps**:
+       1. Sends a POST request to create a new product.
+       2. Verifies if the response status is 200 (OK).
+   """
+    # Data for the new product (of the test user and category)
+    product_data = product_payload()
 
-    # Debug: Print detailed response
-    print(f"Response status code: {response.status_code}")
-    print(f"Response content: {response.content}")
+    response = client.post("/api/v1/products/", json=product_data, headers=auth_headers)
 
-    # Check the JSON response for more details about the error
-    if response.status_code == 422:
-        print("Detailed error:", response.json())
+    assert response.status_code == 200, response.text
 
-    assert response.status_code == 200
+def test_create_products_bulk(client, product_payload, auth_headers):
+    """
+    Test creating several products in one request.
+
+    - **Steps**:
+        1. Sends a POST request with two products of the test category.
+        2. Sends a POST request with a product of an unknown category.
 
-def test_list_products(client, create_test_user, create_category):
+    - **Assertions**:
+        - The first request should return both products.
+        - The second request should return 400.
+    """
+    products_data = [product_payload(name=f"Test Product {index}") for index in range(2)]
+    response = client.post("/api/v1/products/bulk", json=products_data, headers=auth_headers)
+
+    assert response.status_code == 200, response.text
+    assert [product["name"] for product in response.json()] == ["Test Product 0", "Test Product 1"]
+
+    products_data[0]["category_id"] = str(uuid.uuid4())
+    response = client.post("/api/v1/products/bulk", json=products_data, headers=auth_headers)
+
+    assert response.status_code == 400, response.text
+
+def test_list_products(client, test_engine, product_payload, auth_headers):
     """
     Test the listing of products.
 
     - **Steps**:
-        1. Creates a test user and generates an access token.
-        2. Creates a test category and a product.
-        3. Sends a GET request to list the products.
+        1. Lists the products while there are none, caching the empty page.
+        2. Creates a product in the test category.
+        3. Sends a GET request to list the products, counting the SQL queries.
         4. Verifies if the response status is 200 (OK) and if the product is listed.
     """
-    # Gets the token and test user
-    access_token, test_user = create_test_user
-    # Generates a valid access token
-    access_token = create_access_token(data={"sub": test_user.email})
+    product_data = product_payload()
 
-    product_data = {
-        "name": "Test Product",
-        "description": "This is a test product",
-        "price": 100.0,
-        "stock_quantity": 50,
-        "image_url": "http://example.com/product.jpg",
-        "category_id": str(create_category.id),
-        "user_id": str(test_user.id)
-    }
+    # Lists the products once so the empty page is cached
+    assert client.get("/api/v1/products/", headers=auth_headers).json()["items"] == []
 
-    headers = {"Authorization": f"Bearer {access_token}"}
+    # Create a product (invalidates the cached page)
+    client.post("/api/v1/products/", json=product_data, headers=auth_headers)
 
-    # Create a product
-    client.post("/api/v1/products/", json=product_data, headers=headers)
-
-    # Make a request to list the products
-    response = client.get("/api/v1/products/", headers=headers)
-
-    # Debug: Print detailed response
-    print(f"Response status code: {response.status_code}")
-    print(f"Response content: {response.content}")
+    # Make a request to list the products (a single SELECT for the page)
+    with count_queries(test_engine) as queries:
+        response = client.get("/api/v1/products/", headers=auth_headers)
+    assert len(queries) <= 1
 
     # Checks if the status code is 200 and if the product is on the list
-    assert response.status_code == 200
-    assert len(response.json()) > 0  # Check that there is at least one product listed
+    assert response.status_code == 200, response.text
+    response_json = response.json()
+    assert len(response_json["items"]) > 0  # Check that there is at least one product listed
 
     # Checks if the product description is correct
-    assert response.json()[0]['description'] == product_data["description"]
+    assert response_json["items"][0]['description'] == product_data["description"]
 
-def test_read_product(client, create_test_user, create_category):
+def test_read_product(client, test_engine, create_test_user, create_category, product_payload, auth_headers):
     """
     Test reading a specific product.
 
     - **Steps**:
-        1. Creates a test user and generates an access token.
-        2. Creates a test category and a product.
-        3. Sends a GET request to read the product.
-        4. Verifies if the response status is 200 (OK) and if the product data is correct.
+        1. Creates a product in the test category.
+        2. Sends a GET request to read the product, counting the SQL queries.
+        3. Verifies if the response status is 200 (OK) and if the product data is correct.
     """
-    # Gets the token and test user
-    access_token, test_user = create_test_user
-    # Generates a valid access token
-    access_token = create_access_token(data={"sub": test_user.email})
-
-    product_data = {
-        "name": "Test Product",
-        "description": "This is a test product",
-        "price": 100.0,
-        "stock_quantity": 50,
-        "image_url": "http://example.com/product.jpg",
-        "category_id": str(create_category.id),
-        "user_id": str(test_user.id)
-    }
-
-    headers = {"Authorization": f"Bearer {access_token}"}
+    product_data = product_payload()
 
     # Create the product
-    response_create = client.post("/api/v1/products/", json=product_data, headers=headers)
+    response_create = client.post("/api/v1/products/", json=product_data, headers=auth_headers)
     created_product = response_create.json()
 
     # Make a request to read the product
-    response = client.get(f"/api/v1/products/{created_product['id']}", headers=headers)
-
-    print(f"Response status code: {response.status_code}")
-    print(f"Response content: {response.content}")
+    with count_queries(test_engine) as queries:
+        response = client.get(f"/api/v1/products/{created_product['id']}", headers=auth_headers)
+    assert len(queries) <= 1  # A single SELECT for the product
 
     # Check if the answer is 200 OK
-    assert response.status_code == 200
+    assert response.status_code == 200, response.text
 
     # Check that the returned product data is correct
     response_json = response.json()
+    assert response_json["name"] == product_data["name"]
     assert response_json["description"] == product_data["description"]
     assert response_json["price"] == product_data["price"]
     assert response_json["stock_quantity"] == product_data["stock_quantity"]
     assert response_json["image_url"] == product_data["image_url"]
     assert response_json["category_id"] == str(create_category.id)
-    assert response_json["user_id"] == str(test_user.id)
+    assert response_json["user_id"] == str(create_test_user.id)
 
-def test_update_product(client, create_test_user, create_category):
+def test_update_product(client, create_test_user, create_category, product_payload, auth_headers):
     """
     Test updating a product.
 
     - **Steps**:
-        1. Creates a test user and generates an access token.
-        2. Creates a test category and a product.
-        3. Sends a PUT request to update the product.
-        4. Verifies if the response status is 200 (OK) and if the product data is updated.
+        1. Creates a product in the test category.
+        2. Sends a PUT request to update the product.
+        3. Verifies if the response status is 200 (OK) and if the product data is updated.
+        4. Verifies that reading the product again returns the updated data, not the cached one.
     """
-    # Gets the token and test user
-    access_token, test_user = create_test_user
-    # Generates a valid access token
-    access_token = create_access_token(data={"sub": test_user.email})
-
-    product_data = {
-        "name": "Test Product",
-        "description": "This is a test product",
-        "price": 100.0,
-        "stock_quantity": 50,
-        "image_url": "http://example.com/product.jpg",
-        "category_id": str(create_category.id),
-        "user_id": str(test_user.id)
-    }
-
-    headers = {"Authorization": f"Bearer {access_token}"}
+    product_data = product_payload()
 
     # Create the product
-    response_create = client.post("/api/v1/products/", json=product_data, headers=headers)
+    response_create = client.post("/api/v1/products/", json=product_data, headers=auth_headers)
     created_product = response_create.json()
 
+    # Reads the product once so its response is cached
+    assert client.get(f"/api/v1/products/{created_product['id']}").json()["name"] == product_data["name"]
+
     # Updated product data
-    updated_product_data = {
-        "name": "Updated Product",
-        "description": "This is an updated test product",
-        "price": 150.0,
-        "stock_quantity": 30,
-        "image_url": "http://example.com/updated_product.jpg",
-        "category_id": str(create_category.id),
-        "user_id": str(test_user.id)
-    }
+    updated_product_data = product_payload(
+        name="Updated Product",
+        description="This is an updated test product",
+        price=150.0,
+        stock_quantity=30,
+        image_url="http://example.com/updated_product.jpg",
+    )
 
     # Make a request to update the product
-    response_update = client.put(f"/api/v1/products/{created_product['id']}", json=updated_product_data, headers=headers)
+    response_update = client.put(f"/api/v1/products/{created_product['id']}", json=updated_product_data, headers=auth_headers)
 
-    print(f"Response status code: {response_update.status_code}")
-    print(f"Response content: {response_update.content}")
-
-    assert response_update.status_code == 200
+    assert response_update.status_code == 200, response_update.text
 
     # Checks whether the returned product data is up to date
     response_json = response_update.json()
+    assert response_json["name"] == updated_product_data["name"]
     assert response_json["description"] == updated_product_data["description"]
     assert response_json["price"] == updated_product_data["price"]
     assert response_json["stock_quantity"] == updated_product_data["stock_quantity"]
     assert response_json["image_url"] == updated_product_data["image_url"]
     assert response_json["category_id"] == str(create_category.id)
-    assert response_json["user_id"] == str(test_user.id)
+    assert response_json["user_id"] == str(create_test_user.id)
+
+    # The update invalidates the cached product
+    assert client.get(f"/api/v1/products/{created_product['id']}").json()["name"] == updated_product_data["name"]
 
-def test_delete_product(client, create_test_user, create_category):
+def test_delete_product(client, product_payload, auth_headers):
     """
     Test deleting a product.
 
     - **Steps**:
-        1. Creates a test user and generates an access token.
-        2. Creates a test category and a product.
-        3. Sends a DELETE request to delete the product.
-        4. Verifies if the response status is 200 (OK) and if the product no longer exists.
+        1. Creates a product in the test category.
+        2. Sends a DELETE request to delete the product.
+        3. Verifies if the response status is 200 (OK) and if the product no longer exists.
     """
-    # Gets the token and test user
-    access_token, test_user = create_test_user
-
-    # Generate an authentication token for the test user
-    access_token = create_access_token(data={"sub": test_user.email})
-
     # Prepare product data
-    product_data = {
-        "name": "Test Product",
-        "description": "This is a test product",
-        "price": 100.0,
-        "stock_quantity": 50,
-        "image_url": "http://example.com/product.jpg",
-        "category_id": str(create_category.id),
-        "user_id": str(test_user.id)
-    }
-
-    headers = {"Authorization": f"Bearer {access_token}"}
+    product_data = product_payload()
 
     # Create the product
-    response_create = client.post("/api/v1/products/", json=product_data, headers=headers)
+    response_create = client.post("/api/v1/products/", json=product_data, headers=auth_headers)
     created_product = response_create.json()
 
     # Make a request to delete the product
-    response_delete = client.delete(f"/api/v1/products/{created_product['id']}", headers=headers)
-
-    print(f"Response status code: {response_delete.status_code}")
-    print(f"Response content: {response_delete.content}")
+    response_delete = client.delete(f"/api/v1/products/{created_product['id']}", headers=auth_headers)
 
     # Ensure the deletion request was successful
-    assert response_delete.status_code == 200
+    assert response_delete.status_code == 200, response_delete.text
 
     # Try to retrieve the deleted product (should return 404)
-    response_get = client.get(f"/api/v1/products/{created_product['id']}", headers=headers)
-
-    print(f"Response status code after deletion: {response_get.status_code}")
+    response_get = client.get(f"/api/v1/products/{created_product['id']}", headers=auth_headers)
 
     # Ensure the product no longer exists
-    assert response_get.status_code == 404
+    assert response_get.status_code == 404, response_get.text
 
-def test_create_category(client, create_test_user):
+def test_read_transaction(client, product_payload, auth_headers):
     """
-    Test creating a category.
+    Test reading a specific stock movement.
 
     - **Steps**:
-        1. Creates a test user and generates an access token.
-        2. Sends a POST request to create a new category.
-        3. Verifies if the response status is 200 (OK) and if the category data is correct.
+        1. Creates a product in the test category and an entry transaction.
+        2. Sends a GET request to read the transaction.
+        3. Sends a GET request for a transaction that does not exist.
+
+    - **Assertions**:
+        - The first request should return 200 and the transaction's data.
+        - The second request should return 404.
     """
-    # Gets the token and test user
-    access_token, test_user = create_test_user
+    product_data = product_payload()
+    product_id = client.post("/api/v1/products/", json=product_data, headers=auth_headers).json()["id"]
 
-    # Generates a valid access token
-    access_token = create_access_token(data={"sub": test_user.email})
+    transaction = {"product_id": product_id, "type": "entry", "quantity": 5}
+    created = client.post(f"/api/v1/products/{product_id}/transactions", json=transaction, headers=auth_headers).json()
+
+    response = client.get(f"/api/v1/products/{product_id}/transactions/{created['id']}")
+    assert response.status_code == 200, response.text
+    response_json = response.json()
+    assert response_json["id"] == created["id"]
+    assert response_json["quantity"] == 5
 
+    response = client.get(f"/api/v1/products/{product_id}/transactions/{uuid.uuid4()}")
+    assert response.status_code == 404, response.text
+
+def test_create_transaction_insufficient_stock(client, product_payload, auth_headers):
+    """
+    Test recording an exit larger than the available stock.
+
+    - **Steps**:
+        1. Creates a product in the test category with 50 units in stock.
+        2. Sends a POST request with an exit of 60 units.
+
+    - **Assertions**:
+        - The request should return 400.
+        - Neither the stock nor the transaction history should change.
+    """
+    product_data = product_payload()
+    product_id = client.post("/api/v1/products/", json=product_data, headers=auth_headers).json()["id"]
+
+    transaction = {"product_id": product_id, "type": "exit", "quantity": 60}
+    response = client.post(f"/api/v1/products/{product_id}/transactions", json=transaction, headers=auth_headers)
+
+    assert response.status_code == 400, response.text
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock_quantity"] == 50
+    assert client.get(f"/api/v1/products/{product_id}/transactions").json()["items"] == []
+
+def test_create_transactions_bulk(client, product_payload, auth_headers):
+    """
+    Test recording several stock movements in one request.
+
+    - **Steps**:
+        1. Creates a product in the test category.
+        2. Sends a POST request with an entry and an exit transaction.
+        3. Sends a POST request whose exit exceeds the available stock.
+
+    - **Assertions**:
+        - Both transactions of the first request should be recorded and the stock updated.
+        - The second request should return 400 and leave the stock untouched.
+    """
+    product_data = product_payload()
+    created_product = client.post("/api/v1/products/", json=product_data, headers=auth_headers).json()
+    product_id = created_product["id"]
+
+    transactions = [
+        {"product_id": product_id, "type": "entry", "quantity": 10},
+        {"product_id": product_id, "type": "exit", "quantity": 30},
+    ]
+    response = client.post(f"/api/v1/products/{product_id}/transactions/bulk", json=transactions, headers=auth_headers)
+
+    assert response.status_code == 200, response.text
+    assert [transaction["type"] for transaction in response.json()] == ["entry", "exit"]
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock_quantity"] == 30
+
+    transactions = [
+        {"product_id": product_id, "type": "entry", "quantity": 5},
+        {"product_id": product_id, "type": "exit", "quantity": 100},
+    ]
+    response = client.post(f"/api/v1/products/{product_id}/transactions/bulk", json=transactions, headers=auth_headers)
+
+    assert response.status_code == 400, response.text
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock_quantity"] == 30
+
+def test_create_category(client, auth_headers):
+    """
+    Test creating a category.
+
+    - **Steps**:
+        1. Sends a POST request to create a new category.
+        2. Verifies if the response status is 200 (OK) and if the category data is correct.
+    """
     # Data for the new category
     category_data = {
         "name": "Test Category",
         "description": "This is a test category"
     }
 
-    # Headers with the authentication token
-    headers = {"Authorization": f"Bearer {access_token}"}
-
     # Make the request to create the category
-    response = client.post("/api/v1/products/categories", json=category_data, headers=headers)
-
-    # Debug: Displays the status code and content of the response
-    print(f"Response status code: {response.status_code}")
-    print(f"Response content: {response.content}")
+    response = client.post("/api/v1/categories/", json=category_data, headers=auth_headers)
 
     # Checks whether the request was successful (status code 200)
-    if response.status_code == 422:
-        print("Validation error details:", response.json())
-    assert response.status_code == 200
+    assert response.status_code == 200, response.text
 
     # Checks whether the created category data is correct
     response_json = response.json()
     assert response_json["name"] == category_data["name"]
     assert response_json["description"] == category_data["description"]
 
-def test_read_category(client, create_test_user, create_category):
+def test_read_category(client, test_engine, create_category, auth_headers):
     """
     Test reading a specific category.
 
     - **Steps**:
-        1. Creates a test user and generates an access token.
-        2. Creates a test category.
-        3. Sends a GET request to read the category.
-        4. Verifies if the response status is 200 (OK) and if the category data is correct.
+        1. Sends a GET request to read the category, counting the SQL queries.
+        2. Verifies if the response status is 200 (OK) and if the category data is correct.
     """
-    # Gets the token and test user
-    access_token, test_user = create_test_user
-
-    # Generates a valid access token
-    access_token = create_access_token(data={"sub": test_user.email})
-
-    # Create a test category
-    category = create_category
-
-    # Headers with the authentication token
-    headers = {"Authorization": f"Bearer {access_token}"}
-
     # Make a request to read the specific category
-    response = client.get(f"/api/v1/products/categories/{category.id}", headers=headers)
-
-    # Debug: Displays the status code and content of the response
-    print(f"Response status code: {response.status_code}")
-    print(f"Response content: {response.content}")
+    with count_queries(test_engine) as queries:
+        response = client.get(f"/api/v1/categories/{create_category.id}", headers=auth_headers)
+    assert len(queries) <= 1  # A single SELECT for the category
 
     # Checks whether the request was successful (status code 200)
-    assert response.status_code == 200
+    assert response.status_code == 200, response.text
 
     # Checks if the response contains JSON
     response_json = response.json()
-    print(f"Response JSON: {response_json}")  # Debug: Display the full JSON
 
     # Checks whether the returned category data is correct
     assert "id" in response_json, "Field 'id' not found in response"
-    assert response_json["id"] == str(category.id)  # Convert UUID to string
+    assert response_json["id"] == str(create_category.id)  # Convert UUID to string
+
+    assert "name" in response_json, "Field 'name' not found in response"
+    assert response_json["name"] == create_category.name
 
     assert "description" in response_json, "Field 'description' not found in response"
-    assert response_json["description"] == category.description
+    assert response_json["description"] == create_category.description
 
     # Check additional fields if necessary
     assert "date_creation" in response_json, "Field 'date_creation' not found in response"
     assert "date_update" in response_json, "Field 'date_update' not found in response"
 
-def test_delete_category(client, create_test_user, create_category):
+def test_list_categories_pages(client, create_category, auth_headers):
     """
-    Test deleting a category.
+    Test paging through the categories with a cursor.
 
     - **Steps**:
-        1. Creates a test user and generates an access token.
-        2. Creates a test category.
-        3. Sends a DELETE request to delete the category.
-        4. Verifies if the response status is 200 (OK) and if the category no longer exists.
+        1. Creates a second category through the API.
+        2. Requests the first page with `limit=1`.
+        3. Requests the second page with the returned `next_cursor`.
+
+    - **Assertions**:
+        - Each page should hold one category, newest first.
+        - Both pages together should hold both categories.
+        - Only the first page should report a next page.
     """
-    # Gets the token and test user
-    access_token, test_user = create_test_user
+    newest = client.post("/api/v1/categories/", json={"name": "Newest Category"}, headers=auth_headers).json()
 
-    # Generates a valid access token
-    access_token = create_access_token(data={"sub": test_user.email})
+    first_page = client.get("/api/v1/categories/?limit=1").json()
+    assert [category["id"] for category in first_page["items"]] == [newest["id"]]
+    assert first_page["has_more"] is True
+    assert first_page["next_cursor"] is not None
 
-    # Create a test category
-    category = create_category
+    second_page = client.get(f"/api/v1/categories/?limit=1&cursor={first_page['next_cursor']}").json()
+    assert [category["id"] for category in second_page["items"]] == [str(create_category.id)]
+    assert second_page["has_more"] is False
+    assert second_page["next_cursor"] is None
 
-    # Headers with the authentication token
-    headers = {"Authorization": f"Bearer {access_token}"}
+def test_update_category_duplicate_name(client, create_category, auth_headers):
+    """
+    Test renaming a category to the name of another category.
 
-    # Make the request to delete the category
-    response_delete = client.delete(f"/api/v1/products/categories/{category.id}", headers=headers)
+    - **Steps**:
+        1. Creates a second category through the API.
+        2. Sends a PUT request renaming it to the name of the test category.
 
-    # Debug: Displays the status code and content of the response
-    print(f"Response status code: {response_delete.status_code}")
-    print(f"Response content: {response_delete.content}")
+    - **Assertions**:
+        - The response status should be 400 (Bad Request), not 404.
+        - The category should keep its name.
+    """
+    category = client.post("/api/v1/categories/", json={"name": "Renamed Category"}, headers=auth_headers).json()
+
+    response = client.put(
+        f"/api/v1/categories/{category['id']}",
+        json={"name": create_category.name},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 400, response.text
+    assert "Category already exists" in response.json()["message"]
+    assert client.get(f"/api/v1/categories/{category['id']}").json()["name"] == "Renamed Category"
+
+def test_delete_category(client, create_category, auth_headers):
+    """
+    Test deleting a category.
+
+    - **Steps**:
+        1. Sends a DELETE request to delete the category.
+        2. Verifies if the response status is 200 (OK) and if the category no longer exists.
+    """
+    # Make the request to delete the category
+    response_delete = client.delete(f"/api/v1/categories/{create_category.id}", headers=auth_headers)
 
     # Checks whether the request was successful (status code 200)
-    assert response_delete.status_code == 200
+    assert response_delete.status_code == 200, response_delete.text
 
     # Attempts to recover the deleted category (should return 404)
-    response_get = client.get(f"/api/v1/products/categories/{category.id}", headers=headers)
-
-    # Debug: Display status code after deletion
-    print(f"Response status code after deletion: {response_get.status_code}")
+    response_get = client.get(f"/api/v1/categories/{create_category.id}", headers=auth_headers)
 
     # Checks if the category no longer exists
-    assert response_get.status_code == 404
+    assert response_get.status_code == 404, response_get.text
@@ -1,14 +1,39 @@
-from app.utils.auth import verify_password, get_password_hash, create_access_token
+from app.utils.auth import (
+    verify_password,
+    get_password_hash,
+    create_access_token,
+    hash_password_async,
+    verify_password_async,
+    get_current_user,
+    authenticate_user,
+    user_cache,
+    login_cache,
+)
 from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import Session
+import asyncio
+import pytest
 
-def test_verify_password():
+# Fixture to hash the test password once per test run
+@pytest.fixture(scope="session")
+def hashed_password():
+    """
+    Fixture to generate the hash of the test password ("password123").
+
+    - **Returns**:
+        - The hashed password.
+    """
+    return get_password_hash("password123")
+
+def test_verify_password(hashed_password):
     """
     Test the `verify_password` function.
 
     - **Steps**:
-        1. Generates a hash for a plain password.
-        2. Verifies if the plain password matches the hash.
-        3. Verifies if an incorrect password does not match the hash.
+        1. Verifies if the plain password matches the hash of the `hashed_password` fixture.
+        2. Verifies if an incorrect password does not match the hash.
 
     - **Assertions**:
         - The correct password should return `True`.
@@ -17,13 +42,56 @@ def test_verify_password():
     # Original password
     plain_password = "password123"
 
-    # Generates the password hash
-    hashed_password = get_password_hash(plain_password)
-
     # Checks if the password is valid
     assert verify_password(plain_password, hashed_password) == True
     assert verify_password("wrong password", hashed_password) == False
 
+def test_password_async_helpers():
+    """
+    Test the `hash_password_async` and `verify_password_async` functions.
+
+    - **Steps**:
+        1. Generates a hash for a plain password in the hashing executor.
+        2. Verifies the correct and an incorrect password in the hashing executor.
+
+    - **Assertions**:
+        - The correct password should return `True`.
+        - An incorrect password should return `False`.
+    """
+    plain_password = "password123"
+
+    hashed_password = asyncio.run(hash_password_async(plain_password))
+
+    assert asyncio.run(verify_password_async(plain_password, hashed_password)) == True
+    assert asyncio.run(verify_password_async("wrong password", hashed_password)) == False
+
+def test_authenticate_user_caches_successful_logins(hashed_password):
+    """
+    Test that `authenticate_user` skips the password hashing on a repeated successful login.
+
+    - **Steps**:
+        1. Mocks the database session to return a user with a hashed password.
+        2. Logs in twice with the correct password, counting the hash verifications.
+        3. Logs in twice with a wrong password.
+
+    - **Assertions**:
+        - Both correct logins should return the user, with a single verification.
+        - Wrong passwords should return `None` and be verified every time.
+    """
+    login_cache.clear()
+    db = MagicMock(spec=Session)
+    db_user = SimpleNamespace(email="user@example.com", password=hashed_password)
+    db.execute.return_value.first.return_value = db_user
+
+    with patch("app.utils.auth.verify_password_async", wraps=verify_password_async) as verify:
+        assert asyncio.run(authenticate_user(db, "user@example.com", "password123")) is db_user
+        assert asyncio.run(authenticate_user(db, "user@example.com", "password123")) is db_user
+        assert verify.call_count == 1
+
+        assert asyncio.run(authenticate_user(db, "user@example.com", "wrong password")) is None
+        assert asyncio.run(authenticate_user(db, "user@example.com", "wrong password")) is None
+        assert verify.call_count == 3
+
 def test_create_access_token():
     """
     Test the `create_access_token` function.
@@ -43,3 +111,25 @@ def test_create_access_token():
 
     # Checks if the token was created
     assert token is not None
+
+def test_get_current_user_is_cached():
+    """
+    Test that `get_current_user` caches the resolved user per token.
+
+    - **Steps**:
+        1. Mocks the database session to return a user.
+        2. Calls `get_current_user` twice with the same token.
+
+    - **Assertions**:
+        - Both calls should return the same user.
+        - The database should be queried only once.
+    """
+    user_cache.clear()
+    token = create_access_token({"sub": "user@example.com"}, expires_delta=timedelta(minutes=30))
+    db = MagicMock(spec=Session)
+    db_user = SimpleNamespace(email="user@example.com")
+    db.scalar.return_value = db_user
+
+    assert get_current_user(db, token) is db_user
+    assert get_current_user(db, token) is db_user
+    db.scalar.assert_called_once()
@@ -0,0 +1,55 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+from app.utils.pagination import encode_cursor, decode_cursor, page
+
+def test_cursor_round_trip():
+    """
+    Test that `decode_cursor` reverses `encode_cursor`.
+
+    - **Steps**:
+        1. Encodes a timestamp and an ID into a cursor.
+        2. Decodes the cursor.
+
+    - **Assertions**:
+        - The decoded values should match the encoded ones.
+    """
+    last_date = datetime(2025, 1, 31, 12, 30, 45, 123456)
+    last_id = uuid4()
+
+    assert decode_cursor(encode_cursor(last_date, last_id)) == (last_date, last_id)
+
+def test_decode_invalid_cursor():
+    """
+    Test `decode_cursor` with a malformed cursor.
+
+    - **Assertions**:
+        - A `ValueError` should be raised with the message "Invalid cursor".
+    """
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor")
+
+def test_page():
+    """
+    Test the `page` function.
+
+    - **Steps**:
+        1. Builds three rows, as fetched with `LIMIT limit + 1`.
+        2. Builds a page of two rows and a page of three rows from them.
+
+    - **Assertions**:
+        - The first page should drop the extra row and point at its last row.
+        - The second page should be the last one (`has_more` false, no cursor).
+    """
+    rows = [SimpleNamespace(id=uuid4(), date_creation=datetime(2025, 1, day)) for day in (3, 2, 1)]
+
+    first_page = page(rows, limit=2)
+    assert first_page["items"] == rows[:2]
+    assert first_page["has_more"] is True
+    assert decode_cursor(first_page["next_cursor"]) == (rows[1].date_creation, rows[1].id)
+
+    last_page = page(rows, limit=3)
+    assert last_page["items"] == rows
+    assert last_page["has_more"] is False
+    assert last_page["next_cursor"] is None
@@ -1,11 +1,11 @@
-from app.schemas.item_schemas import ProductCreate, CategoryCreate
+from app.schemas.item_schemas import ProductCreate, CategoryCreate, InventoryTransactionCreate
 from pydantic import ValidationError
-from uuid import uuid4
+from uuid import UUID, uuid4
 import pytest
 
-# Valid UUIDs for testing
-valid_category_id = uuid4()
-valid_user_id = uuid4()
+# Valid UUIDs for testing (fixed, so failures are reproducible)
+valid_category_id = UUID("00000000-0000-4000-8000-000000000001")
+valid_user_id = UUID("00000000-0000-4000-8000-000000000002")
 
 def test_product_create_schema():
     """
@@ -62,67 +62,57 @@ def test_category_create_schema():
     assert category.name == "Test Category"
     assert category.description == "Test Category Description"
 
-def test_product_create_edge_cases():
+def test_inventory_transaction_create_type():
     """
-    Test edge cases for the `ProductCreate` schema.
+    Test the `type` field of the `InventoryTransactionCreate` schema.
 
-    - **Test Cases**:
-        1. Negative price (should raise `ValidationError`).
-        2. Zero stock quantity (should raise `ValidationError`).
-        3. Empty name (should raise `ValidationError`).
-        4. Invalid URL (should raise `ValidationError`).
+    - **Steps**:
+        1. Instantiates the schema with each allowed transaction type.
+        2. Instantiates the schema with an unknown transaction type.
 
     - **Assertions**:
-        - Each invalid case should raise a `ValidationError`.
+        - "entry" and "exit" should be accepted.
+        - Any other type should raise `ValidationError`.
     """
-    # Test with negative price (should fail)
-    invalid_data = {
-        "name": "Product Test",
-        "description": "Product Description Test",
-        "price": -10.0,  # Invalid price
-        "stock_quantity": 100,
-        "image_url": "http://example.com/image.jpg",
-        "category_id": valid_category_id
-    }
+    for transaction_type in ("entry", "exit"):
+        transaction = InventoryTransactionCreate(product_id=uuid4(), type=transaction_type, quantity=1)
+        assert transaction.type == transaction_type
 
     with pytest.raises(ValidationError):
-        ProductCreate(**invalid_data)
-
-    # Test with zero stock quantity (should fail)
-    invalid_data = {
-        "name": "Product Test",
-        "description": "Product Description Test",
-        "price": 29.99,
-        "stock_quantity": 0, # Zero quantity
-        "image_url": "http://example.com/image.jpg",
-        "category_id": valid_category_id
-    }
-
-    with pytest.raises(ValidationError):
-        ProductCreate(**invalid_data)
-
-    # Test with empty name (should fail)
-    invalid_data = {
-        "name": "", # Empty name
-        "description": "Product Description Test",
-        "price": 29.99,
-        "stock_quantity": 100,
-        "image_url": "http://example.com/image.jpg",
-        "category_id": valid_category_id
-    }
+        InventoryTransactionCreate(product_id=uuid4(), type="incoming", quantity=1)
+
+# Valid product data, overridden field by field by the edge cases
+VALID_PRODUCT_DATA = {
+    "name": "Product Test",
+    "description": "Product Description Test",
+    "price": 29.99,
+    "stock_quantity": 100,
+    "image_url": "http://example.com/image.jpg",
+    "category_id": valid_category_id,
+    "user_id": valid_user_id
+}
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"price": -10.0}, # Negative price
+        {"stock_quantity": 0}, # Zero stock quantity
+    ],
+    ids=["negative-price", "zero-stock"],
+)
+def test_product_create_edge_cases(override):
+    """
+    Test edge cases for the `ProductCreate` schema.
 
-    with pytest.raises(ValidationError):
-        ProductCreate(**invalid_data)
+    - **Test Cases** (each applied on top of otherwise valid data):
+        1. Negative price (should raise `ValidationError`).
+        2. Zero stock quantity (should raise `ValidationError`).
 
-    # Test with invalid URL (should fail)
-    invalid_data = {
-        "name": "Product Test",
-        "description": "Product Description Test",
-        "price": 29.99,
-        "stock_quantity": 100,
-        "image_url": "invalid-url", # Invalid URL
-        "category_id": valid_category_id
-    }
+    - **Assertions**:
+        - The valid data alone should be accepted.
+        - Each invalid case should raise a `ValidationError`.
+    """
+    ProductCreate(**VALID_PRODUCT_DATA)
 
     with pytest.raises(ValidationError):
-        ProductCreate(**invalid_data)
+        ProductCreate(**{**VALID_PRODUCT_DATA, **override})
@@ -1,6 +1,9 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from uuid import uuid4
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 from app.schemas.item_schemas import (
     ProductCreate,
     InventoryTransactionCreate,
@@ -8,44 +11,48 @@ from app.schemas.item_schemas import (
 )
 from app.services.inventory_service import (
     create_product,
+    create_products,
+    get_products,
     update_product,
     delete_product,
     create_inventory_transaction,
+    create_inventory_transactions,
     create_category,
+    get_categories,
     update_category,
     delete_category
 )
 
-valid_category_id = uuid4()
-valid_product_id = uuid4()
-valid_user_id = uuid4()
-
-@pytest.fixture
-def user_id():
+@pytest.fixture(scope="module")
+def db_session():
     """
-    Fixture to generate a mock user ID.
+    Fixture to mock a database session, shared by every test of the module.
 
     - **Returns**:
-        - A UUID representing a user ID.
+        - A MagicMock instance specced on `Session`, so misspelled session methods fail.
     """
-    return uuid4()  # Returns a mock UUID for the user
+    # Mocking DB session
+    db = MagicMock(spec=Session)
+    yield db
 
-@pytest.fixture
-def db_session():
+@pytest.fixture(autouse=True)
+def reset_db_session(db_session):
     """
-    Fixture to mock a database session.
+    Fixture to reset the shared database session mock before each test.
 
-    - **Returns**:
-        - A MagicMock instance representing a database session.
+    Clears the recorded calls and every configured `return_value` and `side_effect`,
+    so no test sees what a previous one set up.
+
+    - **Parameters**:
+        - `db_session`: The shared database session mock.
     """
-    # Mocking DB session
-    db = MagicMock()
-    yield db
+    db_session.reset_mock(return_value=True, side_effect=True)
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_product_data():
     """
-    Fixture to generate valid product data for testing.
+    Fixture to generate valid product data for testing, shared by every test of the module
+    (tests that need different data use `model_copy`).
 
     - **Returns**:
         - A `ProductCreate` instance with valid data.
@@ -60,7 +67,7 @@ def valid_product_data():
         user_id=str(uuid4())  # Adding the user_id here
     )
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_inventory_transaction_data():
     """
     Fixture to generate valid inventory transaction data for testing.
@@ -75,7 +82,7 @@ def valid_inventory_transaction_data():
         description="Restocking product"
     )
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_category_data():
     """
     Fixture to generate valid category data for testing.
@@ -95,88 +102,90 @@ def test_create_product(db_session, valid_product_data):
     - **Steps**:
         1. Mocks the database session to return a valid category.
         2. Calls the `create_product` function with valid product data.
-        3. Verifies if the returned product matches the input data.
+        3. Verifies if the INSERT statement carries the input data.
 
     - **Assertions**:
-        - The product fields should match the input data.
+        - The inserted values should match the input data.
+        - The product returned by `INSERT ... RETURNING` should be returned.
+        - The database session should commit the changes.
     """
     # Mock category lookup
-    db_session.query.return_value.filter.return_value.first.return_value = MagicMock(id=valid_product_data.category_id)
+    db_session.scalar.return_value = True
 
     product = create_product(db_session, valid_product_data, valid_product_data.user_id)  # Passing the user_id
 
-    assert product.name == valid_product_data.name
-    assert product.description == valid_product_data.description
-    assert product.price == valid_product_data.price
-    assert product.stock_quantity == valid_product_data.stock_quantity
-    assert product.image_url == valid_product_data.image_url
-    assert product.category_id == valid_product_data.category_id
+    params = db_session.execute.call_args.args[0].compile().params
+    assert params["name"] == valid_product_data.name
+    assert params["description"] == valid_product_data.description
+    assert params["price"] == valid_product_data.price
+    assert params["stock_quantity"] == valid_product_data.stock_quantity
+    assert params["image_url"] == valid_product_data.image_url
+    assert params["category_id"] == valid_product_data.category_id
+    assert product is db_session.execute.return_value.scalar_one.return_value
+    db_session.commit.assert_called_once()
 
-def test_create_product_category_not_found(db_session, valid_product_data):
+def test_create_products_category_not_found(db_session, valid_product_data):
     """
-    Test the `create_product` function when the category is not found.
+    Test the `create_products` function when one of the categories is not found.
 
     - **Steps**:
-        1. Mocks the database session to return `None` for the category.
-        2. Calls the `create_product` function.
-        3. Verifies if a `ValueError` is raised with the message "Category not found".
+        1. Mocks the database session so the category lookup finds only the first product's category.
+        2. Calls the `create_products` function with products in two categories.
 
     - **Assertions**:
-        - A `ValueError` should be raised.
+        - A `ValueError` should be raised with the message "Category not found".
+        - Nothing should be inserted or committed.
     """
-    db_session.query.return_value.filter.return_value.first.return_value = None
+    other_product_data = valid_product_data.model_copy(update={"category_id": uuid4()})
+    db_session.scalars.return_value = [valid_product_data.category_id]
 
     with pytest.raises(ValueError, match="Category not found"):
-        create_product(db_session, valid_product_data, str(uuid4()))
+        create_products(db_session, [valid_product_data, other_product_data], str(uuid4()))
+
+    db_session.execute.assert_not_called()
+    db_session.commit.assert_not_called()
+
+def test_get_products_invalid_cursor(db_session):
+    """
+    Test the `get_products` function with a malformed cursor.
+
+    - **Assertions**:
+        - A `ValueError` should be raised with the message "Invalid cursor".
+    """
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        get_products(db_session, cursor="not-a-cursor")
 
 def test_update_product(db_session, valid_product_data):
     """
     Test the `update_product` function with valid data.
 
     - **Steps**:
-        1. Mocks the database session to return a valid product.
-        2. Calls the `update_product` function with updated product data.
-        3. Verifies if the returned product matches the updated data.
+        1. Calls the `update_product` function with updated product data.
+        2. Verifies if the UPDATE statement carries the updated data.
 
     - **Assertions**:
-        - The product fields should match the updated data.
+        - The updated values should match the updated data.
+        - The product returned by `UPDATE ... RETURNING` should be returned.
         - The database session should commit the changes.
     """
     product_id = uuid4()
-    db_product = MagicMock(id=product_id)
-    db_session.query.return_value.filter.return_value.first.return_value = db_product
 
     updated_product_data = valid_product_data.model_copy()
     updated_product_data.name = "Updated Product"
 
     updated_product = update_product(db_session, str(product_id), updated_product_data)
 
-    assert updated_product.name == "Updated Product"
+    params = db_session.execute.call_args.args[0].compile().params
+    assert params["name"] == "Updated Product"
+    assert updated_product is db_session.execute.return_value.scalar_one_or_none.return_value
     db_session.commit.assert_called_once()
 
-def test_update_product_not_found(db_session, valid_product_data):
-    """
-    Test the `update_product` function when the product is not found.
-
-    - **Steps**:
-        1. Mocks the database session to return `None` for the product.
-        2. Calls the `update_product` function.
-        3. Verifies if a `ValueError` is raised with the message "Product not found".
-
-    - **Assertions**:
-        - A `ValueError` should be raised.
-    """
-    db_session.query.return_value.filter.return_value.first.return_value = None
-
-    with pytest.raises(ValueError, match="Product not found"):
-        update_product(db_session, str(uuid4()), valid_product_data)
-
 def test_delete_product(db_session):
     """
     Test the `delete_product` function.
 
     - **Steps**:
-        1. Mocks the database session to return a valid product.
+        1. Mocks the database session so `DELETE ... RETURNING` returns the product.
         2. Calls the `delete_product` function.
         3. Verifies if the returned product matches the deleted product.
 
@@ -185,47 +194,41 @@ def test_delete_product(db_session):
         - The database session should commit the changes.
     """
     product_id = uuid4()
-    db_product = MagicMock(id=product_id)
-    db_session.query.return_value.filter.return_value.first.return_value = db_product
+    db_product = SimpleNamespace(id=product_id)
+    db_session.execute.return_value.scalar_one_or_none.return_value = db_product
 
     deleted_product = delete_product(db_session, str(product_id))
 
     assert deleted_product.id == product_id
     db_session.commit.assert_called_once()
 
-def test_delete_product_not_found(db_session):
+def test_create_inventory_transactions_insufficient_stock(db_session):
     """
-    Test the `delete_product` function when the product is not found.
+    Test the `create_inventory_transactions` function when an exit exceeds the stock.
 
     - **Steps**:
-        1. Mocks the database session to return `None` for the product.
-        2. Calls the `delete_product` function.
-        3. Verifies if a `ValueError` is raised with the message "Product not found".
+        1. Mocks the database session so the conditional stock UPDATE matches no row while the product exists.
+        2. Calls the `create_inventory_transactions` function with an entry followed by a larger exit.
 
     - **Assertions**:
-        - A `ValueError` should be raised.
-    """
-    db_session.query.return_value.filter.return_value.first.return_value = None
-
-    with pytest.raises(ValueError, match="Product not found"):
-        delete_product(db_session, str(uuid4()))
-
-def test_create_inventory_transaction_product_not_found(db_session, valid_inventory_transaction_data):
+        - A `ValueError` should be raised with the message "Insufficient stock quantity".
+        - The UPDATE should require the stock the exit needs beyond the preceding entry.
+        - Nothing should be inserted or committed.
     """
-    Test the `create_inventory_transaction` function when the product is not found.
-
-    - **Steps**:
-        1. Mocks the database session to return `None` for the product.
-        2. Calls the `create_inventory_transaction` function.
-        3. Verifies if a `ValueError` is raised with the message "Product not found".
+    db_session.execute.return_value.scalar_one_or_none.return_value = None
+    db_session.scalar.return_value = uuid4()
+    transactions = [
+        InventoryTransactionCreate(product_id=uuid4(), type="entry", quantity=2),
+        InventoryTransactionCreate(product_id=uuid4(), type="exit", quantity=10),
+    ]
 
-    - **Assertions**:
-        - A `ValueError` should be raised.
-    """
-    db_session.query.return_value.filter.return_value.first.return_value = None
+    with pytest.raises(ValueError, match="Insufficient stock quantity"):
+        create_inventory_transactions(db_session, str(uuid4()), transactions, str(uuid4()))
 
-    with pytest.raises(ValueError, match="Product not found"):
-        create_inventory_transaction(db_session, str(uuid4()), valid_inventory_transaction_data, str(uuid4()))
+    params = db_session.execute.call_args.args[0].compile().params
+    assert 8 in params.values()  # stock_quantity >= 8
+    db_session.execute.assert_called_once()
+    db_session.commit.assert_not_called()
 
 # Simple class to represent the transaction
 class Transaction:
@@ -237,86 +240,82 @@ def test_create_category(db_session, valid_category_data):
     Test the `create_category` function with valid data.
 
     - **Steps**:
-        1. Mocks the database session to return `None` for the category (indicating no existing category).
-        2. Calls the `create_category` function with valid category data.
-        3. Verifies if the returned category matches the input data.
+        1. Calls the `create_category` function with valid category data.
+        2. Verifies if the INSERT statement carries the input data.
 
     - **Assertions**:
-        - The category fields should match the input data.
+        - The inserted values should match the input data.
+        - The category returned by `INSERT ... RETURNING` should be returned.
     """
-    db_session.query.return_value.filter.return_value.first.return_value = None
-
     category = create_category(db_session, valid_category_data)
 
-    assert category.name == valid_category_data.name
-    assert category.description == valid_category_data.description
+    params = db_session.execute.call_args.args[0].compile().params
+    assert params["name"] == valid_category_data.name
+    assert params["description"] == valid_category_data.description
+    assert category is db_session.execute.return_value.scalar_one.return_value
 
 def test_create_category_already_exists(db_session, valid_category_data):
     """
     Test the `create_category` function when the category already exists.
 
     - **Steps**:
-        1. Mocks the database session to return an existing category.
+        1. Mocks the database session so the INSERT violates the unique name constraint.
         2. Calls the `create_category` function.
         3. Verifies if a `ValueError` is raised with the message "Category already exists".
 
     - **Assertions**:
         - A `ValueError` should be raised.
+        - The failed transaction should be rolled back.
     """
-    db_session.query.return_value.filter.return_value.first.return_value = MagicMock()
+    db_session.execute.side_effect = IntegrityError("INSERT INTO categories", {}, Exception("duplicate key"))
 
     with pytest.raises(ValueError, match="Category already exists"):
         create_category(db_session, valid_category_data)
 
+    db_session.rollback.assert_called_once()
+
+def test_get_categories_invalid_cursor(db_session):
+    """
+    Test the `get_categories` function with a malformed cursor.
+
+    - **Assertions**:
+        - A `ValueError` should be raised with the message "Invalid cursor".
+    """
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        get_categories(db_session, cursor="not-a-cursor")
+
 def test_update_category(db_session, valid_category_data):
     """
     Test the `update_category` function with valid data.
 
     - **Steps**:
-        1. Mocks the database session to return a valid category.
-        2. Calls the `update_category` function with updated category data.
-        3. Verifies if the returned category matches the updated data.
+        1. Calls the `update_category` function with updated category data.
+        2. Verifies if the UPDATE statement carries the updated data.
 
     - **Assertions**:
-        - The category fields should match the updated data.
+        - The updated values should match the updated data.
+        - The category returned by `UPDATE ... RETURNING` should be returned.
         - The database session should commit the changes.
     """
     category_id = uuid4()
-    db_category = MagicMock(id=category_id)
-    db_session.query.return_value.filter.return_value.first.return_value = db_category
 
     updated_category_data = valid_category_data.model_copy()
     updated_category_data.name = "Updated Category"
 
     updated_category = update_category(db_session, str(category_id), updated_category_data)
 
-    assert updated_category.name == "Updated Category"
+    params = db_session.execute.call_args.args[0].compile().params
+    assert params["name"] == "Updated Category"
+    assert updated_category is db_session.execute.return_value.scalar_one_or_none.return_value
     db_session.commit.assert_called_once()
 
 
-def test_update_category_not_found(db_session, valid_category_data):
-    """
-    Test the `update_category` function when the category is not found.
-
-    - **Steps**:
-        1. Mocks the database session to return `None` for the category.
-        2. Calls the `update_category` function.
-        3. Verifies if a `ValueError` is raised with the message "Category not found".
-
-    - **Assertions**:
-        - A `ValueError` should be raised.
-    """
-    db_session.query.return_value.filter.return_value.first.return_value = None
-
-    with pytest.raises(ValueError, match="Category not found"):
-        update_category(db_session, str(uuid4()), valid_category_data)
-
 def test_delete_category(db_session):
     """
     Test the `delete_category` function.
 
     - **Steps**:
-        1. Mocks the database session to return a valid category.
+        1. Mocks the database session so `DELETE ... RETURNING` returns the category.
         2. Calls the `delete_category` function.
         3. Verifies if the returned category matches the deleted category.
 
@@ -325,28 +324,58 @@ def test_delete_category(db_session):
         - The database session should commit the changes.
     """
     category_id = uuid4()
-    db_category = MagicMock(id=category_id)
-    db_session.query.return_value.filter.return_value.first.return_value = db_category
+    db_category = SimpleNamespace(id=category_id)
+    db_session.execute.return_value.scalar_one_or_none.return_value = db_category
 
     deleted_category = delete_category(db_session, str(category_id))
 
     assert deleted_category.id == category_id
     db_session.commit.assert_called_once()
 
-
-def test_delete_category_not_found(db_session):
-    """
-    Test the `delete_category` function when the category is not found.
+# Each case: (service function, arguments after the session, expected error message)
+NOT_FOUND_CASES = [
+    pytest.param(create_product, lambda data: (data["product"], str(uuid4())), "Category not found",
+                 id="create_product"),
+    pytest.param(update_product, lambda data: (str(uuid4()), data["product"]), "Product not found",
+                 id="update_product"),
+    pytest.param(delete_product, lambda data: (str(uuid4()),), "Product not found",
+                 id="delete_product"),
+    pytest.param(create_inventory_transaction, lambda data: (str(uuid4()), data["transaction"], str(uuid4())),
+                 "Product not found", id="create_inventory_transaction"),
+    pytest.param(update_category, lambda data: (str(uuid4()), data["category"]), "Category not found",
+                 id="update_category"),
+    pytest.param(delete_category, lambda data: (str(uuid4()),), "Category not found",
+                 id="delete_category"),
+]
+
+@pytest.mark.parametrize("service, build_args, message", NOT_FOUND_CASES)
+def test_not_found(
+    db_session,
+    valid_product_data,
+    valid_inventory_transaction_data,
+    valid_category_data,
+    service,
+    build_args,
+    message,
+):
+    """
+    Test that the service functions raise when the row they work on does not exist.
 
     - **Steps**:
-        1. Mocks the database session to return `None` for the category.
-        2. Calls the `delete_category` function.
-        3. Verifies if a `ValueError` is raised with the message "Category not found".
+        1. Mocks the database session so statements match no row and lookups find nothing.
+        2. Calls the service function.
+        3. Verifies if a `ValueError` is raised with the expected "... not found" message.
 
     - **Assertions**:
         - A `ValueError` should be raised.
     """
-    db_session.query.return_value.filter.return_value.first.return_value = None
+    db_session.execute.return_value.scalar_one_or_none.return_value = None
+    db_session.scalar.return_value = None
+    data = {
+        "product": valid_product_data,
+        "transaction": valid_inventory_transaction_data,
+        "category": valid_category_data,
+    }
 
-    with pytest.raises(ValueError, match="Category not found"):
-        delete_category(db_session, str(uuid4()))
+    with pytest.raises(ValueError, match=message):
+        service(db_session, *build_args(data))